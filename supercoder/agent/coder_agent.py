@@ -1525,9 +1525,10 @@ class CoderAgent:
             messages = self.context.get_messages_for_api()
             get_logger().log_messages(messages)
 
-            # Stream response
-            response_text = ""
-            reasoning_text = ""
+            # Stream response. Chunks are collected in lists and joined once.
+            response_parts: list[str] = []
+            response_len = 0
+            reasoning_parts: list[str] = []
 
             try:
                 for chunk in self.llm.chat_stream(messages):
@@ -1537,17 +1538,18 @@ class CoderAgent:
 
                     if not chunk.is_done:
                         if chunk.reasoning:
-                            reasoning_text += chunk.reasoning
+                            reasoning_parts.append(chunk.reasoning)
                             yield {"type": "reasoning", "content": chunk.reasoning}
                             get_logger().log_stream_event("reasoning", chunk.reasoning)
                         if chunk.content:
                             yield {"type": "token", "content": chunk.content}
-                            response_text += chunk.content
-                            if len(response_text) <= 100:
+                            response_parts.append(chunk.content)
+                            response_len += len(chunk.content)
+                            if response_len <= 100:
                                 get_logger().log_stream_event("token", chunk.content)
 
-                if reasoning_text:
-                    get_logger().log_reasoning(reasoning_text, stage="pre_response")
+                if reasoning_parts:
+                    get_logger().log_reasoning("".join(reasoning_parts), stage="pre_response")
 
             except AgentAbortedError:
                 if checkpoint_active:
@@ -1580,6 +1582,8 @@ class CoderAgent:
                 yield {"type": "error", "content": str(e)}
                 return
 
+            response_text = "".join(response_parts)
+
             # Add assistant response to context
             if response_text:
                 self.context.add_message(Message("assistant", response_text))
@@ -2245,25 +2249,30 @@ class CoderAgent:
             if msg.role != "tool" or msg.name != "command-exec":
                 continue
             content = msg.content or ""
-            lowered = content.lower()
 
             # Prefer the recorded command when available; otherwise fall back
-            # to strict runner tokens in the output body.
+            # to strict runner tokens in the output body. The body is only
+            # lowercased when the command does not settle it, since outputs
+            # can be large.
             command = ""
             if isinstance(msg.display_meta, dict):
                 command = str(msg.display_meta.get("command") or "").lower()
-            is_test = any(tok in command for tok in runner_tokens) or any(
-                tok in lowered for tok in runner_tokens
-            )
-            if not is_test:
-                continue
+            if not any(tok in command for tok in runner_tokens):
+                lowered = content.lower()
+                if not any(tok in lowered for tok in runner_tokens):
+                    continue
 
             counts = {"passed": 0, "failed": 0, "error": 0}
             for n, label in count_re.findall(content):
                 key = "error" if label.lower().startswith("error") else label.lower()
                 counts[key] += int(n)
 
-            first_line = content.splitlines()[0][:80] if content.strip() else "test run"
+            # Split only a short prefix: the first line is capped at 80 chars.
+            first_line = (
+                content[:200].splitlines()[0][:80]
+                if content and not content.isspace()
+                else "test run"
+            )
             if counts["failed"] > 0 or counts["error"] > 0:
                 return f"FAIL — {first_line}"
             if counts["passed"] > 0:
@@ -52,6 +52,11 @@ class AutoCompleter(Completer):
         """
         self.repo_root = Path(repo_root) if repo_root else Path(".")
         self.commands = sorted(commands)
+        # Commands bucketed by their first two characters (lowercased), so a
+        # keystroke only compares against the handful sharing that prefix.
+        self._commands_by_prefix: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        for cmd in self.commands:
+            self._commands_by_prefix[cmd[:2].lower()].append((cmd.lower(), cmd))
         self.rel_fnames = rel_fnames or []
         self.encoding = encoding
 
@@ -150,8 +155,12 @@ class AutoCompleter(Completer):
         """Complete slash commands."""
         if len(words) == 1 and not text.endswith(" "):
             partial = words[0].lower()
-            for cmd in self.commands:
-                if cmd.lower().startswith(partial):
+            if len(partial) < 2:
+                candidates = [(cmd.lower(), cmd) for cmd in self.commands]
+            else:
+                candidates = self._commands_by_prefix.get(partial[:2], ())
+            for cmd_lower, cmd in candidates:
+                if cmd_lower.startswith(partial):
                     yield Completion(cmd, start_position=-len(partial))
 
     def _complete_files(self, partial):
@@ -317,7 +317,7 @@ class CheckpointManager:
         meta_path = self.checkpoint_dir / checkpoint.id / "metadata.json"
         AtomicFileWriter.write(
             meta_path,
-            json.dumps(asdict(checkpoint), indent=2, ensure_ascii=False),
+            json.dumps(asdict(checkpoint), ensure_ascii=False, separators=(",", ":")),
         )
 
     def _delete_checkpoint(self, checkpoint_id: str) -> None:
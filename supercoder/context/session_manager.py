@@ -31,37 +31,21 @@ class ChatSession:
     # Host-generated provenance block from the last compaction (git HEAD,
     # changed files, last test result). Also model context; trust-gated.
     provenance: str | None = None
-
-    def to_dict(self) -> dict[str, Any]:
-        """Convert session to dictionary for JSON serialization."""
-        serialized_messages = []
-        for msg in self.messages:
-            m: dict[str, Any] = {"role": msg.role, "content": msg.content}
-            if msg.tool_calls:
-                m["tool_calls"] = msg.tool_calls
-            if msg.tool_call_id:
-                m["tool_call_id"] = msg.tool_call_id
-            if msg.name:
-                m["name"] = msg.name
-            if msg.display_type:
-                m["display_type"] = msg.display_type
-            if msg.display_summary:
-                m["display_summary"] = msg.display_summary
-            if msg.display_result is not None:
-                m["display_result"] = msg.display_result
-            if msg.display_policy:
-                m["display_policy"] = msg.display_policy
-            if msg.display_meta:
-                m["display_meta"] = msg.display_meta
-            serialized_messages.append(m)
-
+    # Messages already written to the session log, kept so the next save can
+    # append only the new tail. Compared by identity: any rewrite of history
+    # (sliding window, compaction, tool-exchange repair) forces a full rewrite.
+    _persisted_messages: list[Message] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
+    def to_meta_dict(self) -> dict[str, Any]:
+        """Convert session header (everything except messages) to a dictionary."""
         data: dict[str, Any] = {
             "id": self.id,
             "title": self.title,
             "created_at": self.created_at,
             "last_modified": self.last_modified,
             "is_compacted": self.is_compacted,
-            "messages": serialized_messages,
         }
         if self.task_goal is not None:
             data["task_goal"] = self.task_goal
@@ -69,41 +53,82 @@ class ChatSession:
             data["provenance"] = self.provenance
         return data
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert session to dictionary for JSON serialization."""
+        data = self.to_meta_dict()
+        data["messages"] = [_message_to_dict(msg) for msg in self.messages]
+        return data
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ChatSession":
         """Create session from dictionary."""
-        messages = []
-        for m in data.get("messages", []):
-            messages.append(
-                Message(
-                    role=m["role"],
-                    content=m["content"],
-                    tool_calls=m.get("tool_calls"),
-                    tool_call_id=m.get("tool_call_id"),
-                    name=m.get("name"),
-                    display_type=m.get("display_type"),
-                    display_summary=m.get("display_summary"),
-                    display_result=m.get("display_result"),
-                    display_policy=m.get("display_policy"),
-                    display_meta=m.get("display_meta"),
-                )
-            )
         return cls(
             id=data["id"],
             title=data.get("title", "Untitled"),
             created_at=data.get("created_at", ""),
             last_modified=data.get("last_modified", ""),
-            messages=messages,
+            messages=[_message_from_dict(m) for m in data.get("messages", [])],
             is_compacted=data.get("is_compacted", False),
             task_goal=data.get("task_goal"),
             provenance=data.get("provenance"),
         )
 
 
+def _message_to_dict(msg: Message) -> dict[str, Any]:
+    """Serialize a message, omitting unset optional fields."""
+    m: dict[str, Any] = {"role": msg.role, "content": msg.content}
+    if msg.tool_calls:
+        m["tool_calls"] = msg.tool_calls
+    if msg.tool_call_id:
+        m["tool_call_id"] = msg.tool_call_id
+    if msg.name:
+        m["name"] = msg.name
+    if msg.display_type:
+        m["display_type"] = msg.display_type
+    if msg.display_summary:
+        m["display_summary"] = msg.display_summary
+    if msg.display_result is not None:
+        m["display_result"] = msg.display_result
+    if msg.display_policy:
+        m["display_policy"] = msg.display_policy
+    if msg.display_meta:
+        m["display_meta"] = msg.display_meta
+    return m
+
+
+def _message_from_dict(m: dict[str, Any]) -> Message:
+    """Deserialize a message written by ``_message_to_dict``."""
+    return Message(
+        role=m["role"],
+        content=m["content"],
+        tool_calls=m.get("tool_calls"),
+        tool_call_id=m.get("tool_call_id"),
+        name=m.get("name"),
+        display_type=m.get("display_type"),
+        display_summary=m.get("display_summary"),
+        display_result=m.get("display_result"),
+        display_policy=m.get("display_policy"),
+        display_meta=m.get("display_meta"),
+    )
+
+
+def _encode_log_line(msg: Message) -> str:
+    """Serialize one message as a scrubbed JSONL line."""
+    data = scrub_secrets(_message_to_dict(msg))
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
 class SessionManager:
     """Manages chat session persistence.
 
-    Sessions are stored as JSON files in .supercoder/sessions/ directory.
+    Each session is stored in .supercoder/sessions/ as two files: ``<id>.json``
+    holds the header (title, timestamps, task goal, message count) and
+    ``<id>.log.jsonl`` holds one message per line. Saving after a turn appends
+    only the new messages, so per-turn I/O is proportional to the turn rather
+    than the whole conversation. The log is rewritten atomically only when the
+    history itself changed (compression, compaction). Legacy single-file
+    sessions (messages inlined in ``<id>.json``) still load.
+
     Maximum of 10 sessions are kept; oldest sessions are automatically deleted.
     """
 
@@ -125,6 +150,10 @@ class SessionManager:
         self.project_root = Path(project_root)
         self.sessions_dir = self.project_root / ".supercoder" / self.SESSIONS_DIR
         self.allow_loading = allow_loading
+        # list_sessions() header cache: file path -> (stat key, header dict).
+        # The stat key (inode, mtime, size) changes on every atomic rewrite, so
+        # stale entries are never served.
+        self._header_cache: dict[Path, tuple[tuple[int, int, int], dict[str, Any]]] = {}
         self._ensure_sessions_dir()
 
     def _ensure_sessions_dir(self) -> None:
@@ -149,6 +178,10 @@ class SessionManager:
         """Get path to session file."""
         return self.sessions_dir / f"{session_id}.json"
 
+    def _get_log_path(self, session_id: str) -> Path:
+        """Get path to the session's append-only message log."""
+        return self.sessions_dir / f"{session_id}.log.jsonl"
+
     def create_new_session(self) -> ChatSession:
         """Create a new empty session."""
         now = datetime.now().isoformat()
@@ -185,12 +218,8 @@ class SessionManager:
             session.title = (last_msg[:50] + "...") if len(last_msg) > 50 else last_msg
             session.title = session.title.replace("\n", " ").strip()
 
-        # Save to file
-        session_path = self._get_session_path(session.id)
-        AtomicFileWriter.write(
-            session_path,
-            json.dumps(scrub_secrets(session.to_dict()), ensure_ascii=False, indent=2),
-        )
+        self._write_messages(session)
+        self._write_meta(session)
 
         # Cleanup old sessions
         self._cleanup_old_sessions()
@@ -209,11 +238,70 @@ class SessionManager:
         try:
             with open(session_path, encoding="utf-8") as f:
                 data = json.load(f)
-            return ChatSession.from_dict(data)
+            if "messages" in data:
+                # Legacy single-file session; the next save migrates it.
+                return ChatSession.from_dict(data)
+            session = ChatSession.from_dict(data)
+            expected = data.get("message_count", 0)
+            session.messages, complete = self._read_log(session_id, expected)
+            if complete:
+                session._persisted_messages = list(session.messages)
+            return session
         except (json.JSONDecodeError, KeyError):
             # Corrupted session file
             return None
 
+    def _read_log(self, session_id: str, expected: int) -> tuple[list[Message], bool]:
+        """Read up to ``expected`` messages from the session log.
+
+        The header is written after the log, so lines beyond ``expected`` are
+        the remains of an interrupted save and are ignored. Returns the messages
+        and whether the log matched the header exactly; on mismatch the next
+        save rewrites the log instead of appending after stale lines.
+        """
+        messages: list[Message] = []
+        complete = True
+        try:
+            with open(self._get_log_path(session_id), encoding="utf-8") as f:
+                for line in f:
+                    if len(messages) >= expected:
+                        complete = False
+                        break
+                    messages.append(_message_from_dict(json.loads(line)))
+        except FileNotFoundError:
+            pass
+        return messages, complete and len(messages) == expected
+
+    def _write_messages(self, session: ChatSession) -> None:
+        """Persist session messages, appending only the unsaved tail when possible."""
+        log_path = self._get_log_path(session.id)
+        persisted = session._persisted_messages
+        count = len(persisted)
+        if (
+            count
+            and len(session.messages) >= count
+            and all(a is b for a, b in zip(persisted, session.messages, strict=False))
+            and log_path.exists()
+        ):
+            new_messages = session.messages[count:]
+            if new_messages:
+                # Appends cannot go through AtomicFileWriter; a torn tail is
+                # tolerated by _read_log because the header count is written last.
+                with open(log_path, "a", encoding="utf-8", buffering=1 << 20) as f:
+                    f.write("".join(_encode_log_line(m) for m in new_messages))
+        else:
+            AtomicFileWriter.write(log_path, "".join(_encode_log_line(m) for m in session.messages))
+        session._persisted_messages = list(session.messages)
+
+    def _write_meta(self, session: ChatSession) -> None:
+        """Atomically write the session header."""
+        data = session.to_meta_dict()
+        data["message_count"] = len(session.messages)
+        AtomicFileWriter.write(
+            self._get_session_path(session.id),
+            json.dumps(scrub_secrets(data), ensure_ascii=False, separators=(",", ":")),
+        )
+
     def list_sessions(self) -> list[dict[str, Any]]:
         """List all available sessions with metadata.
 
@@ -225,24 +313,37 @@ class SessionManager:
         if not self.allow_loading:
             return []
         sessions = []
+        cache: dict[Path, tuple[tuple[int, int, int], dict[str, Any]]] = {}
 
         for session_file in self.sessions_dir.glob("*.json"):
             try:
-                with open(session_file, encoding="utf-8") as f:
-                    data = json.load(f)
-                sessions.append(
-                    {
+                st = session_file.stat()
+            except FileNotFoundError:
+                continue
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            cached = self._header_cache.get(session_file)
+            if cached is not None and cached[0] == key:
+                header = cached[1]
+            else:
+                try:
+                    with open(session_file, encoding="utf-8") as f:
+                        data = json.load(f)
+                    header = {
                         "id": data.get("id", session_file.stem),
                         "title": data.get("title", "Untitled"),
                         "created_at": data.get("created_at", ""),
                         "last_modified": data.get("last_modified", ""),
                         "is_compacted": data.get("is_compacted", False),
-                        "message_count": len(data.get("messages", [])),
+                        "message_count": data.get("message_count", len(data.get("messages", []))),
                     }
-                )
-            except (json.JSONDecodeError, KeyError):
-                # Skip corrupted files
-                continue
+                except (json.JSONDecodeError, KeyError):
+                    # Skip corrupted files
+                    continue
+            cache[session_file] = (key, header)
+            sessions.append(dict(header))
+
+        # Rebuilt each call, so deleted sessions drop out of the cache.
+        self._header_cache = cache
 
         # Sort by last_modified (newest first)
         sessions.sort(key=lambda s: s.get("last_modified", ""), reverse=True)
@@ -252,6 +353,7 @@ class SessionManager:
     def delete_session(self, session_id: str) -> bool:
         """Delete a session file."""
         session_path = self._get_session_path(session_id)
+        self._get_log_path(session_id).unlink(missing_ok=True)
 
         if session_path.exists():
             session_path.unlink()
@@ -297,12 +399,9 @@ class SessionManager:
             session.task_goal = task_goal
         session.last_modified = datetime.now().isoformat()
 
-        # Save updated session
-        session_path = self._get_session_path(session.id)
-        AtomicFileWriter.write(
-            session_path,
-            json.dumps(scrub_secrets(session.to_dict()), ensure_ascii=False, indent=2),
-        )
+        # History was replaced, so _write_messages rewrites the log in full.
+        self._write_messages(session)
+        self._write_meta(session)
 
     def _cleanup_old_sessions(self) -> None:
         """Remove oldest sessions if we exceed MAX_SESSIONS."""
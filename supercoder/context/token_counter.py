@@ -12,6 +12,13 @@ class TokenCounter:
     # Better to over-estimate (auto-compact early) than under-estimate (overflow).
     FALLBACK_MARGIN = 1.3
 
+    # Tokenizer results for short texts are memoized by content: repeated
+    # strings (tool errors, stock prompts, count_serialized payloads) are
+    # common, and a dict lookup is far cheaper than encoding. Long texts are
+    # rarely repeated and would make the memo large.
+    SHORT_TEXT_MAX_CHARS = 2048
+    SHORT_TEXT_MEMO_SIZE = 4096
+
     def __init__(self, use_tiktoken: bool = True, model: str = "gpt-4"):
         self.encoder = None
         self.model = model
@@ -33,20 +40,46 @@ class TokenCounter:
                 # tiktoken not installed, will use estimation
                 pass
 
+        # Key for the per-message token caches. Distinguishes tokenizers so a
+        # count made by one counter is never served to another.
+        self._cache_key = self.encoder.name if self.encoder else "estimate"
+        self._short_text_counts: dict[str, int] = {}
+        # JSON framing around per-message payloads: {"messages":[...]} and the
+        # optional ,"tools":[...] member. Counted once per counter.
+        self._messages_frame_tokens = self._count_raw('{"messages":[]}')
+        self._tools_key_tokens = self._count_raw(',"tools":')
+        self._tools_tokens_cache: tuple[list[dict], int] | None = None
+
     def count(self, text: str) -> int:
         """Count tokens in text."""
+        return self._apply_margin(self._count_raw(text))
+
+    def _count_raw(self, text: str) -> int:
+        """Count tokens in text without the fallback-encoding margin."""
         if not text:
             return 0
 
         if self.encoder:
-            raw = len(self.encoder.encode(text))
-            if self.is_fallback_encoding:
-                return int(raw * self.FALLBACK_MARGIN)
-            return raw
+            if len(text) > self.SHORT_TEXT_MAX_CHARS:
+                return len(self.encoder.encode(text))
+            memo = self._short_text_counts
+            tokens = memo.get(text)
+            if tokens is None:
+                tokens = len(self.encoder.encode(text))
+                if len(memo) >= self.SHORT_TEXT_MEMO_SIZE:
+                    memo.clear()
+                memo[text] = tokens
+            return tokens
 
         # Fallback estimation: ~4 chars per token for English/code
         return self._estimate_tokens(text)
 
+    def _apply_margin(self, raw: int) -> int:
+        """Apply FALLBACK_MARGIN when the tokenizer does not match the model."""
+        if self.is_fallback_encoding:
+            return int(raw * self.FALLBACK_MARGIN)
+        return raw
+
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count without tiktoken."""
         # More accurate estimation for code:
@@ -67,15 +100,55 @@ class TokenCounter:
         """Count tokens in compact JSON-serialized structured data."""
         if value is None:
             return 0
-        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
-        return self.count(text)
+        return self.count(_serialize(value))
+
+    def count_message(self, msg: Any) -> int:
+        """Count one message's share of a serialized API payload (before margin).
+
+        Covers the compact JSON of the message's API dict plus its list
+        separator, so summing these over a message list and passing the total
+        to ``payload_tokens`` estimates the whole request without serializing
+        or tokenizing it again. Summing parts never undercounts the joined
+        payload; it overestimates by a few percent at most.
+
+        Counts for ``Message`` objects are memoized on the message, keyed by
+        tokenizer. Assigning a payload field on the message clears the cache.
+        """
+        cache = getattr(msg, "_token_counts", None)
+        if cache is not None:
+            cached = cache.get(self._cache_key)
+            if cached is not None:
+                return cached
+        tokens = self._count_raw(_serialize(self._message_to_api_dict(msg))) + 1
+        if cache is not None:
+            cache[self._cache_key] = tokens
+        return tokens
+
+    def payload_tokens(self, message_tokens: int, tools_schema: list[dict] | None = None) -> int:
+        """Estimate request payload tokens from summed ``count_message`` values."""
+        raw = self._messages_frame_tokens + message_tokens
+        if tools_schema:
+            raw += self._tools_key_tokens + self._count_tools_raw(tools_schema)
+        return self._apply_margin(raw)
+
+    def _count_tools_raw(self, tools_schema: list[dict]) -> int:
+        """Count the tools schema, reusing the last result for the same list object."""
+        cached = self._tools_tokens_cache
+        if cached is not None and cached[0] is tools_schema:
+            return cached[1]
+        tokens = self._count_raw(_serialize(tools_schema))
+        self._tools_tokens_cache = (tools_schema, tokens)
+        return tokens
 
     def _message_to_api_dict(self, msg: Any) -> dict:
         """Convert a Message-like object to the shape sent to the chat API."""
-        if hasattr(msg, "to_api_dict"):
-            return msg.to_api_dict()
+        # Dicts first: a failed hasattr() on a dict raises internally.
         if isinstance(msg, dict):
             return msg
+        if hasattr(msg, "api_dict"):
+            return msg.api_dict
+        if hasattr(msg, "to_api_dict"):
+            return msg.to_api_dict()
         return {
             "role": getattr(msg, "role", "user"),
             "content": getattr(msg, "content", ""),
@@ -83,7 +156,10 @@ class TokenCounter:
 
     def count_api_messages(self, messages: list) -> int:
         """Count tokens in serialized API message payloads."""
-        return self.count_serialized([self._message_to_api_dict(msg) for msg in messages])
+        if not messages:
+            return 0
+        # "[" + per-message slots (each carries its trailing separator) + "]"
+        return self._apply_margin(2 + sum(self.count_message(msg) for msg in messages))
 
     def count_tools_schema(self, tools_schema: list[dict] | None) -> int:
         """Count tokens in the serialized native tools schema."""
@@ -93,10 +169,7 @@ class TokenCounter:
 
     def count_api_payload(self, messages: list, tools_schema: list[dict] | None = None) -> int:
         """Count tokens in the request payload shape used by chat_with_tools()."""
-        payload: dict[str, Any] = {"messages": [self._message_to_api_dict(msg) for msg in messages]}
-        if tools_schema:
-            payload["tools"] = tools_schema
-        return self.count_serialized(payload)
+        return self.payload_tokens(sum(self.count_message(msg) for msg in messages), tools_schema)
 
     def count_messages(self, messages: list) -> int:
         """Count tokens in a list of messages."""
@@ -108,6 +181,11 @@ class TokenCounter:
         return self.encoder is not None and not self.is_fallback_encoding
 
 
+def _serialize(value: Any) -> str:
+    """Serialize structured data the way it is sent to the chat API."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
 # Global instance for convenience
 _default_counter = None
 
@@ -56,9 +56,22 @@ class ContextWindowManager:
     def __init__(self, config: ContextConfig | None = None):
         self.config = config or ContextConfig()
         self.counter = TokenCounter()
-        self.history: list[Message] = []
+        self._history: list[Message] = []
+        # Running sum of counter.count_message() over API-visible history, so
+        # fallback stats do not re-tokenize the conversation. None means stale
+        # (history was replaced wholesale) and is recomputed on next use from
+        # the per-message caches.
+        self._history_tokens: int | None = 0
+        # API-visible history in order, appended alongside _history so
+        # get_messages_for_api does not re-filter the conversation per call.
+        # None means stale, like _history_tokens.
+        self._api_history: list[Message] | None = []
         self._system_prompt: str = ""
         self._system_tokens: int = 0
+        # Prefix messages are built once per change rather than per API call so
+        # their cached token counts are reused.
+        self._system_message: Message | None = None
+        self._repo_map_message: Message | None = None
         self._last_response_total_tokens: int | None = None
         self._tools_schema: list[dict] | None = None
         # Stable repo-map block injected between the system prompt and history.
@@ -81,6 +94,7 @@ class ContextWindowManager:
             return
         self._system_prompt = prompt
         self._system_tokens = self.counter.count(prompt)
+        self._system_message = Message("system", prompt) if prompt else None
 
     def set_repo_map_block(self, text: str) -> bool:
         """Set the stable repo-map block. Returns True if it changed.
@@ -92,6 +106,7 @@ class ContextWindowManager:
         if text == self._repo_map_block:
             return False
         self._repo_map_block = text
+        self._repo_map_message = Message("user", text) if text else None
         return True
 
     def set_task_goal(self, goal: str) -> None:
@@ -112,9 +127,53 @@ class ContextWindowManager:
         """Set the native tools schema used for fallback request-size estimation."""
         self._tools_schema = tools_schema
 
+    @property
+    def history(self) -> list[Message]:
+        """Conversation history (without system prompt or repo map).
+
+        Kept as a list rather than a deque: compression, protected-tail
+        selection and the tool-call index all use random access by position.
+        Evictions are batched into a single rebuild instead of repeated
+        front pops, so a list costs nothing extra there.
+        """
+        return self._history
+
+    @history.setter
+    def history(self, messages: list[Message]) -> None:
+        self._history = messages
+        self._history_tokens = None
+        self._api_history = None
+
     def add_message(self, message: Message) -> None:
         """Add a message to history without changing latest API usage."""
-        self.history.append(message)
+        self._history.append(message)
+        if self._is_api_visible(message):
+            if self._history_tokens is not None:
+                self._history_tokens += self.counter.count_message(message)
+            if self._api_history is not None:
+                self._api_history.append(message)
+
+    @staticmethod
+    def _is_api_visible(msg: Message) -> bool:
+        """Return True for messages sent to the model (thinking is display-only)."""
+        return msg.display_type != "thinking"
+
+    def _api_visible_history(self) -> list[Message]:
+        """Return API-visible history (shared list; do not mutate), rebuilding if stale."""
+        if self._api_history is None:
+            self._api_history = [m for m in self._history if self._is_api_visible(m)]
+        return self._api_history
+
+    def _api_history_tokens(self) -> int:
+        """Return the payload tokens of API-visible history, recomputing if stale."""
+        if self._history_tokens is None:
+            count = self.counter.count_message
+            self._history_tokens = sum(count(msg) for msg in self._api_visible_history())
+        return self._history_tokens
+
+    def _prefix_messages(self) -> list[Message]:
+        """Return the ``[system][repo_map]`` messages that precede history."""
+        return [m for m in (self._system_message, self._repo_map_message) if m is not None]
 
     def get_messages(self) -> list[Message]:
         """Get all messages in history."""
@@ -131,20 +190,19 @@ class ContextWindowManager:
         preserves the system-prompt prefix in the LLM KV/prompt cache when the
         map changes during a session.
         """
-        messages = []
-        if self._system_prompt:
-            messages.append(Message("system", self._system_prompt))
-        if self._repo_map_block:
-            messages.append(Message("user", self._repo_map_block))
-        messages.extend(m for m in self.history if m.display_type != "thinking")
+        messages = self._prefix_messages()
+        messages.extend(self._api_visible_history())
         return messages
 
+    def _used_tokens(self) -> int:
+        """Return used context tokens: the last API-reported total, else the estimate."""
+        if self._last_response_total_tokens is not None:
+            return self._last_response_total_tokens
+        return self._estimate_current_payload_tokens()
+
     def get_stats(self) -> ContextStats:
         """Get current context utilization statistics."""
-        if self._last_response_total_tokens is not None:
-            used = self._last_response_total_tokens
-        else:
-            used = self._estimate_current_payload_tokens()
+        used = self._used_tokens()
         total = max(1, self.config.max_tokens)
 
         return ContextStats(
@@ -157,7 +215,9 @@ class ContextWindowManager:
 
     def clear(self) -> None:
         """Clear conversation history."""
-        self.history = []
+        self._history = []
+        self._history_tokens = 0
+        self._api_history = []
         self._last_response_total_tokens = None
 
     def set_max_tokens(self, max_tokens: int) -> None:
@@ -206,23 +266,23 @@ class ContextWindowManager:
         """Return True when history should be compacted at the next safe boundary."""
         if not self.config.auto_compact:
             return False
-
-        compactable_count = sum(
-            1
-            for msg in self.history
-            if msg.display_type not in ("thinking", "mode_policy")
-            and not self._is_compact_summary(msg)
-        )
-        if compactable_count <= self.config.protected_recent_steps:
+        if self._used_tokens() < self.config.max_tokens * self.config.auto_compact_threshold:
             return False
 
-        stats = self.get_stats()
-        return stats.used_tokens >= self.config.max_tokens * self.config.auto_compact_threshold
+        # Only reached above the threshold; stop counting once past the limit.
+        protected = self.config.protected_recent_steps
+        compactable_count = 0
+        for msg in self.history:
+            if msg.display_type in ("thinking", "mode_policy") or self._is_compact_summary(msg):
+                continue
+            compactable_count += 1
+            if compactable_count > protected:
+                return True
+        return False
 
     def should_emergency_compress(self) -> bool:
         """Return True when hard trimming is needed to avoid overflowing the context."""
-        stats = self.get_stats()
-        return stats.used_tokens >= self.config.max_tokens * self.config.compression_threshold
+        return self._used_tokens() >= self.config.max_tokens * self.config.compression_threshold
 
     def force_compress(self) -> None:
         """Run the configured compression strategy immediately."""
@@ -377,63 +437,71 @@ class ContextWindowManager:
         return call_owner, call_results
 
     def _sliding_window_compress(self) -> None:
-        """Remove oldest messages to fit in context, keeping tool-call pairs intact."""
-        target = self.config.max_tokens * 0.5  # Compress to 50%
+        """Remove oldest messages to fit in context, keeping tool-call pairs intact.
 
-        while len(self.history) > self.config.min_messages_to_keep:
-            stats = self.get_stats()
-            if stats.used_tokens <= target:
-                break
-            if len(self.history) <= 1:
+        Accounting is incremental: the payload estimate starts from the cached
+        history total and is decremented by each dropped message's cached
+        count, and the tool-call index is built once over the original
+        positions. History is rebuilt a single time at the end, so dropping k
+        of N messages costs O(N) instead of O(k * N) stats and index rebuilds.
+        """
+        history = self.history
+        min_keep = self.config.min_messages_to_keep
+        target = self.config.max_tokens * 0.5  # Compress to 50%
+        count = self.counter.count_message
+        prefix_tokens = sum(count(m) for m in self._prefix_messages())
+        history_tokens = self._api_history_tokens()
+        call_owner, call_results = self._build_tool_call_index(history)
+        removed: set[int] = set()
+        remaining = len(history)
+        first = 0
+
+        while remaining > min_keep and remaining > 1:
+            used = self.counter.payload_tokens(prefix_tokens + history_tokens, self._tools_schema)
+            if used <= target:
                 break
-
-            # Drop a cluster, not a single message: if history[0] is an assistant
-            # with tool_calls, drop it together with its results; if it is a tool
-            # result, drop it together with its owner and the owner's other
-            # results. Otherwise just drop the single oldest message.
-            call_owner, call_results = self._build_tool_call_index(self.history)
-            first = self.history[0]
-            to_remove = {0}
-            if first.role == "assistant" and first.tool_calls:
-                for raw_call in first.tool_calls:
+            while first in removed:
+                first += 1
+
+            # Drop a cluster, not a single message: if the oldest message is an
+            # assistant with tool_calls, drop it together with its results; if it
+            # is a tool result, drop it together with its owner and the owner's
+            # other results. Otherwise just drop the single oldest message.
+            oldest = history[first]
+            to_remove = {first}
+            if oldest.role == "assistant" and oldest.tool_calls:
+                for raw_call in oldest.tool_calls:
                     call_id = raw_call.get("id")
                     if isinstance(call_id, str):
                         for result_idx in call_results.get(call_id, []):
                             to_remove.add(result_idx)
-            elif first.role == "tool" and first.tool_call_id:
-                owner_idx = call_owner.get(first.tool_call_id)
+            elif oldest.role == "tool" and oldest.tool_call_id:
+                owner_idx = call_owner.get(oldest.tool_call_id)
                 if owner_idx is not None:
                     to_remove.add(owner_idx)
-                    for raw_call in self.history[owner_idx].tool_calls or []:
+                    for raw_call in history[owner_idx].tool_calls or []:
                         call_id = raw_call.get("id")
                         if isinstance(call_id, str):
                             for result_idx in call_results.get(call_id, []):
                                 to_remove.add(result_idx)
 
             for idx in sorted(to_remove, reverse=True):
-                if len(self.history) > self.config.min_messages_to_keep:
-                    self.history.pop(idx)
-
-    def _kept_payload_tokens(self, kept_indices: set[int]) -> int:
-        """Estimate real API payload tokens for the kept messages + system + tools.
-
-        Uses TokenCounter.count_api_payload so tool_calls, tool_call_id, name
-        and tools-schema overhead are all counted (D-031). This is the same
-        shape chat_with_tools() sends, so the budget check reflects what the
-        API actually sees.
-        """
-        kept = [
-            Message(
-                self.history[i].role,
-                self.history[i].content,
-                tool_calls=self.history[i].tool_calls,
-                tool_call_id=self.history[i].tool_call_id,
-                name=self.history[i].name,
-            )
-            for i in sorted(kept_indices)
-        ]
-        system = [Message("system", self._system_prompt)] if self._system_prompt else []
-        return self.counter.count_api_payload([*system, *kept], self._tools_schema)
+                if remaining > min_keep and idx not in removed:
+                    removed.add(idx)
+                    remaining -= 1
+                    if self._is_api_visible(history[idx]):
+                        history_tokens -= count(history[idx])
+
+        if removed:
+            self._history = [msg for i, msg in enumerate(history) if i not in removed]
+            self._history_tokens = history_tokens
+            self._api_history = None
+
+    def _system_slot_tokens(self) -> int:
+        """Return the system message's payload tokens (0 without a prompt)."""
+        if self._system_message is None:
+            return 0
+        return self.counter.count_message(self._system_message)
 
     def _smart_compress(self) -> None:
         """Smart compression that keeps important messages.
@@ -447,56 +515,48 @@ class ContextWindowManager:
         if len(self.history) <= self.config.min_messages_to_keep:
             return
 
-        # Always protect the most recent min_messages_to_keep messages. The
-        # rest are candidates for dropping.
-        history_len = len(self.history)
-        protected = {
-            history_len - 1 - i for i in range(min(self.config.min_messages_to_keep, history_len))
-        }
-
-        # Score messages by importance. Scoring is display_type-driven (D-017)
-        # so it works in native mode; the streaming-only <@TOOL_RESULT> marker
-        # is intentionally not matched.
-        scores: dict[int, float] = {}
-        for i, msg in enumerate(self.history):
-            score = i / history_len * 50.0  # recency
-
-            if msg.display_type == "tool_result" or msg.role == "tool":
-                score += 30
-            if msg.display_type == "error":
-                score += 25
-            if msg.role == "tool" and "```" in msg.content:
-                score += 20
-            if msg.role == "assistant" and ("def " in msg.content or "class " in msg.content):
-                score += 10
-            scores[i] = score
+        # Always protect the most recent min_messages_to_keep messages (the
+        # tail, indices >= tail_start). Only the prefix is scored and
+        # considered for dropping.
+        history = self.history
+        history_len = len(history)
+        tail_start = history_len - self.config.min_messages_to_keep
+
+        scores = [
+            self._importance_score(msg, i / history_len)
+            for i, msg in enumerate(history[:tail_start])
+        ]
+        count = self.counter.count_message
+        payload_tokens = self.counter.payload_tokens
+        tools_schema = self._tools_schema
 
         # Seed kept set with protected messages.
-        kept_indices: set[int] = set(protected)
+        kept_indices: set[int] = set(range(tail_start, history_len))
+        kept_tokens = self._system_slot_tokens() + sum(count(m) for m in history[tail_start:])
 
         # Add non-protected messages by descending score until the target is
         # reached. This is the "prefer important messages" selection. Budget is
-        # measured via count_api_payload (D-031) so tool_calls overhead counts.
+        # measured as the API payload (D-031) so tool_calls overhead counts; a
+        # running total of cached per-message counts keeps each check O(1).
+        # Every candidate is visited (a large one that does not fit must not
+        # stop smaller ones), so a full sort is needed rather than a top-K.
         target = self.config.max_tokens * 0.5
-        for i in sorted(
-            (idx for idx in range(history_len) if idx not in protected),
-            key=lambda idx: scores[idx],
-            reverse=True,
-        ):
-            trial = kept_indices | {i}
-            if self._kept_payload_tokens(trial) <= target:
+        for i in sorted(range(tail_start), key=scores.__getitem__, reverse=True):
+            msg_tokens = count(history[i])
+            if payload_tokens(kept_tokens + msg_tokens, tools_schema) <= target:
                 kept_indices.add(i)
+                kept_tokens += msg_tokens
 
         # Close tool-call pairs iteratively: for every kept tool(result) pull
         # in its assistant(tool_calls) owner, and for every kept assistant
         # (tool_calls) pull in all its results. Mirrors get_protected_recent
         # _messages (lines 204-242).
-        call_owner, call_results = self._build_tool_call_index(self.history)
+        call_owner, call_results = self._build_tool_call_index(history)
         changed = True
         while changed:
             changed = False
             for idx in list(kept_indices):
-                msg = self.history[idx]
+                msg = history[idx]
                 if msg.role == "tool" and msg.tool_call_id:
                     owner_idx = call_owner.get(msg.tool_call_id)
                     if owner_idx is not None and owner_idx not in kept_indices:
@@ -516,13 +576,13 @@ class ContextWindowManager:
         # only clusters whose members are all non-protected. Parity is
         # preserved at the cost of the budget (D-036).
         def cluster_of(idx: int) -> set[int]:
-            msg = self.history[idx]
+            msg = history[idx]
             members = {idx}
             if msg.role == "tool" and msg.tool_call_id:
                 owner_idx = call_owner.get(msg.tool_call_id)
                 if owner_idx is not None:
                     members.add(owner_idx)
-                    for raw_call in self.history[owner_idx].tool_calls or []:
+                    for raw_call in history[owner_idx].tool_calls or []:
                         cid = raw_call.get("id")
                         if isinstance(cid, str):
                             members.update(call_results.get(cid, []))
@@ -533,20 +593,17 @@ class ContextWindowManager:
                         members.update(call_results.get(cid, []))
             return members
 
-        def current_total() -> int:
-            # Count the real API payload (system + kept messages + tools schema)
-            # so tool_calls/tool_call_id/name overhead is included (D-031).
-            return self._kept_payload_tokens(kept_indices)
-
         # Build per-cluster grouping of droppable (all non-protected) kept
         # clusters, sorted by lowest member score (drop least important first).
         seen: set[int] = set()
         droppable_clusters: list[tuple[float, set[int]]] = []
         for idx in sorted(kept_indices):
-            if idx in seen or idx in protected:
+            if idx >= tail_start:
+                break
+            if idx in seen:
                 continue
             members = cluster_of(idx)
-            if any(m in protected for m in members):
+            if any(m >= tail_start for m in members):
                 # Crossing into protected: cannot drop without breaking parity
                 # of a protected message. Skip whole cluster.
                 seen.update(members)
@@ -557,18 +614,56 @@ class ContextWindowManager:
 
         droppable_clusters.sort(key=lambda c: c[0])
 
-        while current_total() > self.config.max_tokens and droppable_clusters:
-            _score, members = droppable_clusters.pop(0)
-            kept_indices -= members
-
-        # Rebuild history in order
-        self.history = [msg for i, msg in enumerate(self.history) if i in kept_indices]
+        # Count the real API payload (system + kept messages + tools schema)
+        # so tool_calls/tool_call_id/name overhead is included (D-031). The
+        # parity pass may have added messages, so recount once, then keep a
+        # running total while dropping.
+        kept_tokens = self._system_slot_tokens() + sum(count(history[i]) for i in kept_indices)
+        drop_at = 0
+        while payload_tokens(kept_tokens, tools_schema) > self.config.max_tokens and drop_at < len(
+            droppable_clusters
+        ):
+            _score, members = droppable_clusters[drop_at]
+            drop_at += 1
+            dropped = members & kept_indices
+            kept_indices -= dropped
+            kept_tokens -= sum(count(history[i]) for i in dropped)
+
+        # Rebuild history in order; the protected tail is kept as a slice.
+        kept_prefix = [history[i] for i in sorted(kept_indices) if i < tail_start]
+        self.history = kept_prefix + history[tail_start:]
+
+    @staticmethod
+    def _importance_score(msg: Message, recency: float) -> float:
+        """Score a message for smart compression; ``recency`` is its position in [0, 1).
+
+        Scoring is display_type-driven (D-017) so it works in native mode; the
+        streaming-only <@TOOL_RESULT> marker and a generic "error" substring are
+        intentionally not matched. Content is scanned only for the role that
+        uses the feature, with plain substring tests (faster than a regex
+        alternation for two or three literals).
+        """
+        score = recency * 50.0
+        role = msg.role
+        if role == "tool" or msg.display_type == "tool_result":
+            score += 30
+        if msg.display_type == "error":
+            score += 25
+        if role == "tool":
+            if "```" in msg.content:
+                score += 20
+        elif role == "assistant" and ("def " in msg.content or "class " in msg.content):
+            score += 10
+        return score
 
     def estimate_response_fit(self, response_tokens: int) -> bool:
         """Check if a response of given size would fit."""
-        stats = self.get_stats()
-        return stats.available_tokens >= response_tokens
+        return self.config.max_tokens - self._used_tokens() >= response_tokens
 
     def _estimate_current_payload_tokens(self) -> int:
         """Estimate the current chat_with_tools() request payload."""
-        return self.counter.count_api_payload(self.get_messages_for_api(), self._tools_schema)
+        count = self.counter.count_message
+        prefix_tokens = sum(count(m) for m in self._prefix_messages())
+        return self.counter.payload_tokens(
+            prefix_tokens + self._api_history_tokens(), self._tools_schema
+        )
@@ -11,7 +11,12 @@ if TYPE_CHECKING:
     from ..abort_controller import AbortController
 
 
-@dataclass
+# Fields that feed the API payload; assigning one drops the cached payload
+# dict and token counts derived from it.
+_API_FIELDS = frozenset({"role", "content", "tool_calls", "tool_call_id", "name"})
+
+
+@dataclass(slots=True)
 class Message:
     """Chat message.
 
@@ -36,6 +41,32 @@ class Message:
     display_result: str | None = field(default=None, repr=False)
     display_policy: str | None = None  # "compact", "expanded", "hidden", "error"
     display_meta: dict[str, Any] | None = field(default=None, repr=False)
+    # Serialized-payload token counts keyed by tokenizer, filled lazily by
+    # TokenCounter.count_message. Not part of equality or the API payload.
+    _token_counts: dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Cached result of to_api_dict(), built on first access of api_dict.
+    _api_dict: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in _API_FIELDS:
+            object.__setattr__(self, "_api_dict", None)
+            object.__setattr__(self, "_token_counts", {})
+
+    @property
+    def api_dict(self) -> dict:
+        """The API payload dict, built once and shared across requests.
+
+        Treat the result as read-only; use ``to_api_dict()`` for a copy that
+        may be modified.
+        """
+        d = self._api_dict
+        if d is None:
+            d = self.to_api_dict()
+            object.__setattr__(self, "_api_dict", d)
+        return d
 
     def to_api_dict(self) -> dict:
         """Serialize to a dict suitable for the OpenAI messages array."""
@@ -29,39 +29,42 @@ class OpenAIClient(BaseLLM):
 
     def __init__(self, config: Config):
         self.config = config
+        # One OpenAI client (and its HTTP connection pool) per endpoint, so
+        # switching back to a profile reuses its warm connections.
+        self._clients: dict[tuple[str, str, float], OpenAI] = {}
 
-        # Add headers for OpenRouter app identification
-        default_headers = {
-            "HTTP-Referer": self.APP_URL,
-            "X-Title": self.APP_NAME,
-        }
-
-        self.client = OpenAI(
-            api_key=config.api_key,
-            base_url=config.base_url,
-            default_headers=default_headers,
-            timeout=config.request_timeout,
-        )
+        self.client = self._get_client(config.api_key, config.base_url, config.request_timeout)
         self.model = config.model
         self.temperature = config.temperature
         self.top_p = config.top_p
         self.debug = config.debug
 
+    def _get_client(self, api_key: str, base_url: str, timeout: float) -> OpenAI:
+        """Return the cached client for these credentials, creating it on first use."""
+        key = (api_key, base_url, timeout)
+        client = self._clients.get(key)
+        if client is None:
+            # Add headers for OpenRouter app identification
+            default_headers = {
+                "HTTP-Referer": self.APP_URL,
+                "X-Title": self.APP_NAME,
+            }
+            client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                default_headers=default_headers,
+                timeout=timeout,
+            )
+            self._clients[key] = client
+        return client
+
     def switch_model(self, profile: ModelProfile) -> None:
         """Switch to a different model profile.
 
-        Reinitializes the OpenAI client with new credentials.
+        Reuses the client already created for the profile's credentials and
+        endpoint, or creates one.
         """
-        default_headers = {
-            "HTTP-Referer": self.APP_URL,
-            "X-Title": self.APP_NAME,
-        }
-        self.client = OpenAI(
-            api_key=profile.api_key,
-            base_url=profile.endpoint,
-            default_headers=default_headers,
-            timeout=profile.request_timeout,
-        )
+        self.client = self._get_client(profile.api_key, profile.endpoint, profile.request_timeout)
         self.model = profile.model
         self.temperature = profile.temperature
         self.top_p = profile.top_p if profile.top_p is not None else self.config.top_p
@@ -72,7 +75,7 @@ class OpenAIClient(BaseLLM):
 
     def chat(self, messages: list[Message]) -> str:
         """Send messages and get complete response."""
-        api_messages = [m.to_api_dict() for m in messages]
+        api_messages = [m.api_dict for m in messages]
         kwargs: dict = {
             "model": self.model,
             "messages": api_messages,  # type: ignore[arg-type]
@@ -98,7 +101,7 @@ class OpenAIClient(BaseLLM):
         """
         kwargs: dict = {
             "model": self.model,
-            "messages": [m.to_api_dict() for m in messages],
+            "messages": [m.api_dict for m in messages],
             "temperature": self.temperature,
         }
         if self.top_p is not None:
@@ -191,7 +194,7 @@ class OpenAIClient(BaseLLM):
 
         kwargs: dict = {
             "model": self.model,
-            "messages": [m.to_api_dict() for m in messages],
+            "messages": [m.api_dict for m in messages],
             "temperature": self.temperature,
             "stream": True,
             "stream_options": {"include_usage": True},
@@ -321,7 +324,7 @@ class OpenAIClient(BaseLLM):
             Streaming mode is deprecated. Use ``chat_with_tools()`` for
             reliable native tool calling instead.
         """
-        api_messages = [m.to_api_dict() for m in messages]
+        api_messages = [m.api_dict for m in messages]
         kwargs: dict = {
             "model": self.model,
             "messages": api_messages,  # type: ignore[arg-type]
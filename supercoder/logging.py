@@ -1,6 +1,10 @@
 """Conversation logging for debugging and analysis."""
 
+import atexit
+import contextlib
 import json
+import threading
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
@@ -8,9 +12,54 @@ from typing import Any
 
 from .utils.secret_scrubber import scrub_secrets
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Log directory
 LOG_DIR = Path.home() / ".supercoder" / "logs"
 
+# Streaming events are buffered on the open handle and flushed in batches;
+# every other entry type is written through so readers (tests, the recall
+# tool) always see it immediately.
+_BUFFERED_TYPES = frozenset({"stream_event"})
+_FLUSH_EVERY = 32
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") of the last timestamp.
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def _encode_entry(entry: dict) -> bytes:
+    """Serialize one log entry as a UTF-8 JSON line, using orjson when installed."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # Non-str keys or >64-bit ints; the stdlib encoder handles them
+    return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _timestamp() -> str:
+    """Return the local time as a ``datetime.isoformat()``-style timestamp.
+
+    Microseconds are omitted when they are zero, as ``isoformat()`` does.
+
+    Streamed entries arrive many per second, so the formatted seconds part is
+    reused and only the microseconds are appended.
+    """
+    global _ts_cache
+    ns = time.time_ns()
+    secs = ns // 1_000_000_000
+    cached_secs, prefix = _ts_cache
+    if secs != cached_secs:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(secs))
+        _ts_cache = (secs, prefix)
+    micros = ns // 1000 % 1_000_000
+    return f"{prefix}.{micros:06d}" if micros else prefix
+
 
 def ensure_log_dir() -> Path:
     """Create logs directory if it doesn't exist."""
@@ -27,6 +76,9 @@ class ConversationLogger:
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = LOG_DIR / f"session_{self.session_id}.jsonl"
         self.enabled = enabled
+        self._fh: Any = None
+        self._pending = 0
+        self._lock = threading.Lock()
 
         # Write session header
         if self.enabled:
@@ -34,7 +86,7 @@ class ConversationLogger:
                 {
                     "type": "session_start",
                     "model": self.model_name,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _timestamp(),
                 }
             )
 
@@ -45,7 +97,7 @@ class ConversationLogger:
             {
                 "type": "model_switch",
                 "model": model_name,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -57,7 +109,7 @@ class ConversationLogger:
             {
                 "type": "user",
                 "content": message,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -70,7 +122,7 @@ class ConversationLogger:
                 "type": "assistant",
                 "model": model or self.model_name,
                 "content": response,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -83,7 +135,7 @@ class ConversationLogger:
                 "type": "reasoning",
                 "stage": stage,
                 "content": reasoning,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -95,7 +147,7 @@ class ConversationLogger:
             "type": "stream_event",
             "event_type": event_type,
             "content": content[:500] if content else "",  # Truncate
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
         }
         if meta:
             entry["meta"] = meta
@@ -109,7 +161,7 @@ class ConversationLogger:
             {
                 "type": "system_prompt",
                 "content": prompt,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -120,7 +172,9 @@ class ConversationLogger:
         # Convert Message objects to dicts if needed
         serializable_messages = []
         for msg in messages:
-            if hasattr(msg, "to_api_dict"):
+            if hasattr(msg, "api_dict"):
+                serializable_messages.append(msg.api_dict)
+            elif hasattr(msg, "to_api_dict"):
                 serializable_messages.append(msg.to_api_dict())
             elif isinstance(msg, dict):
                 serializable_messages.append(msg)
@@ -136,7 +190,7 @@ class ConversationLogger:
             {
                 "type": "api_request",
                 "messages": serializable_messages,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -149,7 +203,7 @@ class ConversationLogger:
                 "type": "tool_call",
                 "tool": tool_name,
                 "arguments": arguments,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -171,7 +225,7 @@ class ConversationLogger:
                 "count": count,
                 "formats": formats or [],
                 "reason": reason,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -191,7 +245,7 @@ class ConversationLogger:
                 "attempt": attempt,
                 "max_attempts": max_attempts,
                 "reason": reason,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -206,7 +260,7 @@ class ConversationLogger:
                 "type": "tool_result",
                 "tool": tool_name,
                 "result": truncated,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -231,7 +285,7 @@ class ConversationLogger:
                 "original_chars": original_chars,
                 "model_chars": model_chars,
                 "offload_path": offload_path,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -243,7 +297,7 @@ class ConversationLogger:
             {
                 "type": "context_attachment",
                 "summary": summary,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -269,7 +323,7 @@ class ConversationLogger:
                 "reason": reason,
                 "source": source,
                 "matched_rule": matched_rule,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -293,7 +347,7 @@ class ConversationLogger:
                 "rule_action": rule_action,
                 "rule": rule[:300],
                 "source": source,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -317,7 +371,7 @@ class ConversationLogger:
                 "operation": operation,
                 "approved": approved,
                 "decision": decision,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -341,7 +395,7 @@ class ConversationLogger:
                 "action": action,
                 "reason": reason,
                 "subject": subject[:300],
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -369,7 +423,7 @@ class ConversationLogger:
                 "reason": reason,
                 "size": size,
                 "hash_present": hash_present,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _timestamp(),
             }
         )
 
@@ -385,7 +439,7 @@ class ConversationLogger:
         entry: dict[str, Any] = {
             "type": "error",
             "error": str(error),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
         }
         if include_traceback and isinstance(error, BaseException):
             entry["traceback"] = traceback.format_exception(error)
@@ -406,21 +460,57 @@ class ConversationLogger:
             "type": "error",
             "error": context or "Unhandled exception",
             "traceback": tb,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
         }
         self._write_entry(entry)
 
     def _write_entry(self, entry: dict) -> None:
-        """Write a log entry to file."""
+        """Write a log entry to file.
+
+        The file is opened once and kept open. Streaming events accumulate in
+        the write buffer and are flushed every ``_FLUSH_EVERY`` entries; any
+        other entry flushes immediately, together with whatever is pending.
+        """
         if not self.enabled:
             return
         try:
-            ensure_log_dir()
-            scrubbed = scrub_secrets(entry)
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(scrubbed, ensure_ascii=False) + "\n")
+            line = _encode_entry(scrub_secrets(entry))
+            with self._lock:
+                if self._fh is None:
+                    ensure_log_dir()
+                    self._fh = open(self.log_file, "ab", buffering=8192)  # noqa: SIM115
+                self._fh.write(line)
+                self._pending += 1
+                if entry.get("type") not in _BUFFERED_TYPES or self._pending >= _FLUSH_EVERY:
+                    self._fh.flush()
+                    self._pending = 0
         except Exception:
-            pass  # Fail silently - logging should not break the app
+            self._drop_handle()  # Fail silently - logging should not break the app
+
+    def flush(self) -> None:
+        """Flush buffered entries to disk."""
+        with self._lock:
+            if self._fh is None:
+                return
+            try:
+                self._fh.flush()
+                self._pending = 0
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """Flush and close the log file handle; a later write reopens it."""
+        self.flush()
+        self._drop_handle()
+
+    def _drop_handle(self) -> None:
+        """Detach the log file handle under the lock, then close it."""
+        with self._lock:
+            fh, self._fh = self._fh, None
+            self._pending = 0
+        if fh is not None:
+            with contextlib.suppress(Exception):
+                fh.close()
 
     @property
     def log_path(self) -> Path:
@@ -443,5 +533,13 @@ def get_logger() -> ConversationLogger:
 def init_logger(model_name: str, enabled: bool = True) -> ConversationLogger:
     """Initialize logger with model name."""
     global _logger
+    if _logger is not None:
+        _logger.close()
     _logger = ConversationLogger(model_name, enabled=enabled)
     return _logger
+
+
+@atexit.register
+def _close_logger() -> None:
+    if _logger is not None:
+        _logger.close()
@@ -122,6 +122,11 @@ class MarkdownStream:
             style: Optional style for the markdown (e.g., color)
         """
         self.printed = []
+        # Source prefix whose rendering is final: text[:_stable_source_offset]
+        # renders to the first _stable_line_count lines of self.printed and is
+        # never re-rendered.
+        self._stable_source_offset = 0
+        self._stable_line_count = 0
         self.mdargs = mdargs or {}
         if style:
             self.mdargs["style"] = style
@@ -174,11 +179,14 @@ class MarkdownStream:
 
         # Measure render time and adjust throttle
         start = time.time()
-        lines = self._render_markdown_to_lines(text)
+        stable = self._stable_line_count
+        lines = self._render_markdown_to_lines(text[self._stable_source_offset :])
         render_time = time.time() - start
         self.min_delay = min(max(render_time * 10, 1.0 / 20), 2)
 
-        num_lines = len(lines)
+        # Line counts below are for the whole document; `lines` holds only the
+        # part after the first `stable` rendered lines.
+        num_lines = stable + len(lines)
 
         # How many lines are "stable" (left the live window)?
         if not final:
@@ -196,11 +204,11 @@ class MarkdownStream:
                 return
 
         if show > 0:
-            show_lines = lines[num_printed:num_lines]
+            show_lines = lines[num_printed - stable : num_lines - stable]
             show_text = "".join(show_lines)
             show_text = Text.from_ansi(show_text)
             self.live.console.print(show_text)
-            self.printed = lines[:num_lines]
+            self.printed.extend(show_lines)
 
         # Final cleanup
         if final:
@@ -211,7 +219,39 @@ class MarkdownStream:
             return
 
         # Update live window with remaining lines
-        rest = lines[num_lines:]
+        rest = lines[num_lines - stable :]
         rest_text = "".join(rest)
         rest_text = Text.from_ansi(rest_text)
         self.live.update(rest_text)
+
+        if show > 0:
+            self._advance_stable_offset(text, lines)
+
+    def _advance_stable_offset(self, text, lines):
+        """Move the stable source boundary forward to a printed paragraph break.
+
+        ``lines`` is the current rendering of the unstable tail. The candidate
+        boundary is the last blank line before the final ``live_window`` source
+        lines. It is accepted only if rendering the text after it on its own
+        reproduces the end of ``lines`` exactly (so paragraphs, lists and code
+        fences are not split) and everything before it is already printed.
+        """
+        offset = self._stable_source_offset
+        limit = len(text)
+        for _ in range(self.live_window):
+            limit = text.rfind("\n", offset, limit)
+            if limit <= offset:
+                return
+        idx = text.rfind("\n\n", offset, limit)
+        if idx <= offset:
+            return
+        boundary = idx + 2
+
+        rest = self._render_markdown_to_lines(text[boundary:])
+        cut = len(lines) - len(rest)
+        if cut <= 0 or lines[cut:] != rest:
+            return
+        if self._stable_line_count + cut > len(self.printed):
+            return
+        self._stable_source_offset = boundary
+        self._stable_line_count += cut
@@ -1,19 +1,26 @@
 """Interactive REPL for SuperCoder."""
 
+import json
+import os
 import re
 import shlex
-import sys
+import shutil
 import textwrap
 import threading
 import time
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.lexers import PygmentsLexer
+from prompt_toolkit.history import FileHistory, ThreadedHistory
 from prompt_toolkit.styles import Style as PromptStyle
-from pygments.lexers.markup import MarkdownLexer
 from rich import box
-from rich.console import Console, Group
+from rich.console import Console, Group, NewLine, RenderableType
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.rule import Rule
@@ -30,6 +37,93 @@ from .permissions import PermissionAction
 from .ui import banner, render, spinners, theme
 from .utils import format_relative_time
 
+# Patterns for SuperCoderREPL._filter_special_tokens, compiled once per process.
+# Complete tool-call blocks as (opener, closer) literals, removed in this order
+# by _strip_delimited_blocks.
+_TOOL_BLOCK_DELIMITERS = (
+    # tool_code blocks: ```tool_code ... ```
+    ("```tool_code", "```"),
+    # Our native tool call format: <@TOOL>...</@TOOL>
+    ("<@TOOL>", "</@TOOL>"),
+    # GLM-style tool calls: <tool_call>...</tool_call>
+    ("<tool_call>", "</tool_call>"),
+    # Model-generated TOOL_RESULT blocks (model shouldn't generate these!)
+    ("<@TOOL_RESULT>", "</@TOOL_RESULT>"),
+    # Complete Qwen-style blocks: <|start|>...<|call|>
+    ("<|start|>", "<|call|>"),
+)
+# Prefixes followed by a JSON object, stripped by _strip_nested_json.
+_GPT_OSS_CALL_PREFIX = re.compile(r"<\|channel\|>.*?<\|message\|>", re.DOTALL)
+_SIMPLE_CALL_PREFIX = re.compile(r"to=(?:tool[:\.]|TOOL\s+)[\w-]+\s*", re.IGNORECASE)
+# Case variants of "to=" that _SIMPLE_CALL_PREFIX (case-insensitive) can start with.
+_SIMPLE_CALL_PROBES = ("to=", "TO=", "To=", "tO=")
+_SPECIAL_MARKER = re.compile(r"<\|[^|]+\|>")
+# Written with a literal "\n\n\n" prefix rather than \n{3,}: the regex engine
+# can then skip ahead to candidate positions instead of trying every newline.
+_EXCESS_NEWLINES = re.compile(r"\n\n\n+")
+# A unified diff header pair ("--- a" line followed by a "+++ b" line), skipping
+# the "--- head"/"--- tail" markers of compacted tool output.
+_DIFF_HEADER = re.compile(r"^--- (?!head|tail).*\n\+\+\+ ", re.MULTILINE)
+# Tool argument names that carry a file path, for the touched-files footer.
+_FILE_KEYS = frozenset(
+    ("file", "filepath", "fileName", "path", "filename", "target_file", "source_file")
+)
+
+
+def _json_loads(text: str):
+    """Decode JSON tool arguments, using orjson when installed."""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity or lone surrogates; the stdlib decoder decides
+    return json.loads(text)
+
+
+def _json_pretty(obj) -> str:
+    """Encode tool arguments as 2-space indented JSON, using orjson when installed."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            pass  # Non-str keys or >64-bit ints; the stdlib encoder handles them
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# Command name -> REPL method name. Bound methods are looked up per instance.
+_COMMANDS = {
+    "/ask": "cmd_ask",
+    "/plan": "cmd_plan",
+    "/code": "cmd_code",
+    "/accept-edits": "cmd_accept_edits",
+    "/accept": "cmd_accept_edits",
+    "/edit": "cmd_accept_edits",
+    "/clear": "cmd_clear",
+    "/compact": "cmd_compact",
+    "/continue": "cmd_continue",
+    "/undo": "cmd_undo",
+    "/help": "cmd_help",
+    "/config": "cmd_config",
+    "/stats": "cmd_stats",
+    "/debug": "cmd_debug",
+    "/models": "cmd_models",
+    "/model": "cmd_model",
+    "/permissions": "cmd_permissions",
+    "exit": "cmd_exit",
+    "/exit": "cmd_exit",
+    "quit": "cmd_quit",
+    "/quit": "cmd_quit",
+}
+_COMMAND_NAMES = tuple(_COMMANDS)
+# First characters a command can start with (either case), used to skip
+# command lookup for ordinary chat input without tokenizing it.
+_COMMAND_INITIALS = frozenset(ch for name in _COMMANDS for ch in (name[0].lower(), name[0].upper()))
+# Tool output longer than this is cut to its first _DISPLAY_TEXT_HEAD chars
+# before it reaches Rich, whose wrapping cost grows with the text length.
+# The full output is still in the session log and in the model context.
+_DISPLAY_TEXT_LIMIT = 50_000
+_DISPLAY_TEXT_HEAD = 2_000
+
 
 class SuperCoderREPL:
     """Interactive Read-Eval-Print Loop for SuperCoder."""
@@ -38,34 +132,17 @@ class SuperCoderREPL:
         self.agent = agent
         self.console = Console()
         self.no_banner = no_banner
+        # "<repo_root>/" for turning absolute tool paths into repo-relative ones.
+        self._repo_root_prefix = os.path.join(str(agent.repo_root), "")
 
-        # Initialize commands BEFORE session setup (session uses commands for autocomplete)
-        self.commands = {
-            "/ask": self.cmd_ask,
-            "/plan": self.cmd_plan,
-            "/code": self.cmd_code,
-            "/accept-edits": self.cmd_accept_edits,
-            "/accept": self.cmd_accept_edits,
-            "/edit": self.cmd_accept_edits,
-            "/clear": self.cmd_clear,
-            "/compact": self.cmd_compact,
-            "/continue": self.cmd_continue,
-            "/undo": self.cmd_undo,
-            "/help": self.cmd_help,
-            "/config": self.cmd_config,
-            "/stats": self.cmd_stats,
-            "/debug": self.cmd_debug,
-            "/models": self.cmd_models,
-            "/model": self.cmd_model,
-            "/permissions": self.cmd_permissions,
-            "exit": self.cmd_exit,
-            "/exit": self.cmd_exit,
-            "quit": self.cmd_quit,
-            "/quit": self.cmd_quit,
-        }
+        self.commands = {name: getattr(self, method) for name, method in _COMMANDS.items()}
 
-        # Now setup session (uses self.commands)
-        self.session = self._setup_session()
+        # The prompt session (history file, lexer, completers) is built on first
+        # use by the ``session`` property.
+        self._session = None
+        # Panel titles by (title, color, icon). Tool blocks repeat the same few
+        # titles all session; Panel copies a Text title, so sharing is safe.
+        self._block_titles: dict[tuple[str, str, str], Text] = {}
 
         # Setup interrupt handler for double-ESC
         self.interrupt_handler = InterruptHandler(
@@ -86,10 +163,19 @@ class SuperCoderREPL:
         # prompt_toolkit/Rich are both managing terminal state.
         print("\rPress ESC again to interrupt", end="", flush=True)
 
+    @property
+    def session(self):
+        """The prompt_toolkit session, created on first access."""
+        if self._session is None:
+            self._session = self._setup_session()
+        return self._session
+
     def _setup_session(self):
         """Configure prompt_toolkit session."""
         from prompt_toolkit.completion import ThreadedCompleter
         from prompt_toolkit.key_binding import KeyBindings
+        from prompt_toolkit.lexers import PygmentsLexer
+        from pygments.lexers.markup import MarkdownLexer
 
         from .autocomplete import AutoCompleter, SlashCommandAutoSuggest
 
@@ -103,12 +189,12 @@ class SuperCoderREPL:
         # Enhanced autocomplete with file and command support
         auto_completer = AutoCompleter(
             repo_root=self.agent.repo_root,
-            commands=list(self.commands.keys()),
+            commands=list(_COMMAND_NAMES),
         )
         completer = ThreadedCompleter(auto_completer)
 
         # Inline auto-suggest for slash commands (gray text)
-        auto_suggest = SlashCommandAutoSuggest(commands=list(self.commands.keys()))
+        auto_suggest = SlashCommandAutoSuggest(commands=list(_COMMAND_NAMES))
 
         # Key bindings for multiline support
         kb = KeyBindings()
@@ -133,12 +219,13 @@ class SuperCoderREPL:
             self._cycle_mode()
             event.app.invalidate()
 
-        # History file in project-specific directory
+        # History file in project-specific directory. ThreadedHistory reads it
+        # on a background thread so a long history does not delay the first prompt.
         history_path = self.agent.repo_root / ".supercoder" / "history"
         history_path.parent.mkdir(parents=True, exist_ok=True)
 
         return PromptSession(
-            history=FileHistory(str(history_path)),
+            history=ThreadedHistory(FileHistory(str(history_path))),
             lexer=PygmentsLexer(MarkdownLexer),
             style=style,
             completer=completer,
@@ -220,37 +307,23 @@ class SuperCoderREPL:
                     continue
 
                 # Check for slash commands
-                cmd_parts = user_input.split()
-                cmd = cmd_parts[0].lower()
-
-                if cmd in self.commands:
-                    if self.commands[cmd](user_input):
+                handler = self._lookup_command(user_input)
+                if handler is not None:
+                    if handler(user_input):
                         break
                     continue
 
                 # Process chat - replace input line(s) with styled version
                 # Calculate actual terminal lines (including wrapped text)
-                import shutil
-
                 terminal_width = shutil.get_terminal_size().columns
                 prompt_prefix_len = len(self._get_prompt())
 
-                # Calculate total visual lines by accounting for terminal wrapping
-                visual_lines = 0
-                for line in user_input.split("\n"):
-                    # First line includes prompt, subsequent lines don't (in prompt_toolkit)
-                    line_len = len(line) + prompt_prefix_len if visual_lines == 0 else len(line)
-
-                    # Count how many terminal lines this logical line takes
-                    if line_len == 0:
-                        visual_lines += 1
-                    else:
-                        visual_lines += (line_len + terminal_width - 1) // terminal_width
+                visual_lines = self._input_visual_lines(
+                    user_input, prompt_prefix_len, terminal_width
+                )
 
-                # Move up and clear each visual line
-                for _ in range(visual_lines):
-                    sys.stdout.write("\033[A\033[2K")  # Move up + clear line
-                sys.stdout.flush()
+                # Move up over the echoed input and clear it in one escape sequence
+                self._clear_transient_lines(visual_lines)
                 self.console.print(render.render_user_message(user_input, live=True))
                 self._handle_chat(user_input)
 
@@ -267,6 +340,16 @@ class SuperCoderREPL:
 
         self.console.print("[green]Goodbye![/]")
 
+    def _lookup_command(self, user_input: str):
+        """Return the command handler for ``user_input``, or None for chat.
+
+        Only the first whitespace-delimited word is matched (case-insensitive),
+        and only when its first character can start a command at all.
+        """
+        if not user_input or user_input[0] not in _COMMAND_INITIALS:
+            return None
+        return self.commands.get(user_input.split(None, 1)[0].lower())
+
     def _handle_chat(self, message):
         """Handle chat interaction — dispatches to native or streaming handler."""
         if self.agent.streaming:
@@ -284,7 +367,8 @@ class SuperCoderREPL:
         touched_files = set()
         was_aborted = False
 
-        spinner = self.console.status(
+        spinner = spinners.status(
+            self.console,
             "[bold blue]SuperCoder is thinking...[/]",
             spinner=spinners.DEFAULT_SPINNER_NAME,
         )
@@ -318,8 +402,10 @@ class SuperCoderREPL:
                 spinner.update(spinners.wave_gradient_for(self.console, text, _gen_frame[0]))
                 _gen_frame[0] += 1
 
-        _tick_thread = threading.Thread(target=_tick, daemon=True)
-        _tick_thread.start()
+        # Without a terminal the spinner is a no-op, so there is nothing to animate.
+        if self.console.is_terminal:
+            _tick_thread = threading.Thread(target=_tick, daemon=True)
+            _tick_thread.start()
 
         def _on_chunk(n):
             _gen_tokens[0] = n
@@ -354,17 +440,16 @@ class SuperCoderREPL:
 
                 elif event_type == "tool_call":
                     spinner.stop()
-                    self._print_output_spacer()
-                    self._display_tool_call(content)
-                    self._track_files(content, touched_files)
+                    args_obj = self._tool_args_dict(content.get("arguments"))
+                    self._print_spaced(self._build_tool_call_panel(content, args_obj))
+                    self._track_files(content, touched_files, args_obj)
                     name = content.get("name", "tool")
                     spinner.update(f"[bold blue]Executing {name}...[/]")
                     spinner.start()
 
                 elif event_type == "tool_result":
                     spinner.stop()
-                    self._print_output_spacer()
-                    self._display_tool_result(content)
+                    self._print_spaced(self._build_tool_result_panel(content))
                     _gen_tokens[0] = 0
                     _gen_start = time.monotonic()
                     _gen_phase[0] = "tool call"
@@ -383,8 +468,11 @@ class SuperCoderREPL:
 
                 elif event_type == "warning":
                     spinner.stop()
-                    self._print_output_spacer()
-                    self._print_block(f"[yellow]{content}[/]", "Warning", "yellow", "!")
+                    self._print_spaced(
+                        self._build_block(
+                            Text(str(content), style="yellow"), "Warning", "yellow", "!"
+                        )
+                    )
                     spinner.update("[bold blue]SuperCoder is thinking...[/]")
                     spinner.start()
 
@@ -466,33 +554,30 @@ class SuperCoderREPL:
             self.agent.abort_controller.reset()
 
         # === Post-processing ===
+        # The spinner is stopped by now, so the end-of-turn blocks are collected
+        # and written with a single console.print instead of one per block.
+        renderables: list[RenderableType] = []
         if rollback_info:
-            restored = rollback_info.get("restored", [])
-            failed = rollback_info.get("failed", [])
-            reason = rollback_info.get("reason", "Unknown")
-            rollback_lines = [f"[dim]Reason: {reason}[/]"]
-            rollback_lines.extend(f"  ✓ Restored: {f}" for f in restored)
-            rollback_lines.extend(f"  [red]✗ Failed: {f}[/]" for f in failed)
-            rollback_content = "\n".join(rollback_lines)
-            if failed:
-                self._print_block(rollback_content, "PARTIAL ROLLBACK", "yellow", "⚠")
-            else:
-                self._print_block(rollback_content, "Files Rolled Back", "cyan", "↩")
+            renderables.append(self._build_rollback_block(rollback_info))
 
         # Display Abort notification (mirrors the streaming handler).
         if was_aborted:
-            self._print_block(
-                "[bold yellow]Agent execution was interrupted by user (ESC)[/]",
-                "Interrupted",
-                "yellow",
-                "⚠",
+            renderables.append(
+                self._build_block(
+                    "[bold yellow]Agent execution was interrupted by user (ESC)[/]",
+                    "Interrupted",
+                    "yellow",
+                    "⚠",
+                )
             )
 
-        for error in errors:
-            self._print_block(f"[red]{error}[/]", "Error", "red", "❌")
-
-        self._display_status_footer(touched_files)
-        self.console.print(Rule(style="dim grey50"))
+        renderables.extend(
+            self._build_block(Text(str(error), style="red"), "Error", "red", "❌")
+            for error in errors
+        )
+        renderables.append(self._build_status_footer(touched_files))
+        renderables.append(Rule(style="dim grey50"))
+        self.console.print(Group(*renderables))
 
     def _handle_chat_streaming(self, message):
         """Handle chat interaction with streaming output.
@@ -506,8 +591,8 @@ class SuperCoderREPL:
         """
         from .streaming_buffer import StreamingDisplayBuffer
 
-        # Buffers
-        reasoning_text = ""
+        # Buffers (parts lists, joined once when flushed)
+        reasoning_parts: list[str] = []
         errors = []
         was_aborted = False
         rollback_info = None
@@ -516,41 +601,39 @@ class SuperCoderREPL:
         # --- Streaming state ---
         is_streaming = False
         display_buffer = None
-        accumulated_display = ""  # All safe text received so far (tags already stripped by buffer)
-        _printed_up_to = 0  # Character offset into accumulated_display up to which we've printed
+        # Safe text not yet printed (tags already stripped by buffer). Printed
+        # paragraphs are dropped, so appends copy only the pending tail rather
+        # than the whole response so far.
+        pending_display = ""
 
         # --- Spinner (manual start/stop) ---
-        spinner = self.console.status("[bold blue]SuperCoder is thinking...[/]", spinner="dots")
+        spinner = spinners.status(self.console, "[bold blue]SuperCoder is thinking...[/]")
         spinner.start()
 
         def flush_reasoning():
             """Output accumulated reasoning as a block."""
-            nonlocal reasoning_text
-            clean = self._filter_special_tokens(reasoning_text)
+            if not reasoning_parts:
+                return
+            clean = self._filter_special_tokens("".join(reasoning_parts))
             if clean.strip():
                 self._print_block(clean.strip(), "Reasoning", "magenta", "💭")
-            reasoning_text = ""
+            reasoning_parts.clear()
 
         def start_streaming():
             """Switch from spinner to paragraph streaming."""
-            nonlocal is_streaming, display_buffer, accumulated_display, _printed_up_to
+            nonlocal is_streaming, display_buffer, pending_display
             # Stop spinner FIRST — printing while Rich's Live/Status is active
             # corrupts cursor tracking and produces rendering artifacts.
             spinner.stop()
             flush_reasoning()
             display_buffer = StreamingDisplayBuffer(self.agent.tool_calling_type)
-            accumulated_display = ""
-            _printed_up_to = 0
+            pending_display = ""
             is_streaming = True
 
         def print_new_paragraphs():
-            """Print newly completed paragraphs as Markdown using offset tracking.
-
-            Uses character offset (_printed_up_to) into accumulated_display so that
-            leading/trailing empty strings from split() do not distort the count.
-            """
-            nonlocal _printed_up_to
-            unprinted = accumulated_display[_printed_up_to:]
+            """Print newly completed paragraphs as Markdown and drop them from pending_display."""
+            nonlocal pending_display
+            unprinted = pending_display
             if not unprinted:
                 return
             # Find the last paragraph boundary in unprinted text
@@ -559,7 +642,7 @@ class SuperCoderREPL:
                 to_print = unprinted[:boundary].strip()
                 if to_print:
                     self.console.print(Markdown(to_print))
-                _printed_up_to += boundary + 2  # advance past the \n\n
+                pending_display = unprinted[boundary + 2 :]  # keep what follows the \n\n
             elif len(unprinted) >= 300:
                 # Very long paragraph — force-print at last line break
                 last_nl = unprinted.rfind("\n")
@@ -567,11 +650,11 @@ class SuperCoderREPL:
                     to_print = unprinted[:last_nl].strip()
                     if to_print:
                         self.console.print(Markdown(to_print))
-                    _printed_up_to += last_nl + 1
+                    pending_display = unprinted[last_nl + 1 :]
 
         def stop_streaming():
             """Finalize streaming, print any remaining text."""
-            nonlocal is_streaming, display_buffer, accumulated_display, _printed_up_to
+            nonlocal is_streaming, display_buffer, pending_display
             if not is_streaming or display_buffer is None:
                 spinner.stop()
                 flush_reasoning()
@@ -579,46 +662,53 @@ class SuperCoderREPL:
 
             # Flush any text still held in the buffer
             remaining = display_buffer.flush()
-            accumulated_display += remaining
+            pending_display += remaining
 
-            # Print everything after the last printed offset.
+            # Print everything not yet printed.
             # StreamingDisplayBuffer already stripped tool-call tags, so we do NOT
             # call _filter_special_tokens here — that would destroy \n\n boundaries.
-            unprinted = accumulated_display[_printed_up_to:].strip()
+            unprinted = pending_display.strip()
             if unprinted:
                 self.console.print(Markdown(unprinted))
 
             display_buffer = None
-            accumulated_display = ""
-            _printed_up_to = 0
+            pending_display = ""
             is_streaming = False
 
         # --- Event processing ---
         if hasattr(self, "keyboard_listener"):
             self.keyboard_listener.start()
 
+        append_reasoning = reasoning_parts.append
         try:
             for event in self.agent.chat_stream(message):
                 event_type = event.get("type")
                 content = event.get("content")
 
-                if event_type == "reasoning":
-                    reasoning_text += content
-
-                elif event_type == "token":
+                # Token and reasoning events outnumber all others put together,
+                # so they are tested first.
+                if event_type == "token":
                     if not is_streaming:
                         start_streaming()
 
                     assert display_buffer is not None  # set by start_streaming()
                     chunk = display_buffer.add(content)
                     if chunk:
-                        accumulated_display += chunk
-                        print_new_paragraphs()
+                        pending_display += chunk
+                        # New text becomes printable only at a line break or once
+                        # the pending text reaches the forced-flush length; skip
+                        # the boundary scan for the other chunks.
+                        if "\n" in chunk or len(pending_display) >= 300:
+                            print_new_paragraphs()
+
+                elif event_type == "reasoning":
+                    append_reasoning(content)
 
                 elif event_type == "tool_call":
                     stop_streaming()
-                    self._display_tool_call(content)
-                    self._track_files(content, touched_files)
+                    args_obj = self._tool_args_dict(content.get("arguments"))
+                    self.console.print(self._build_tool_call_panel(content, args_obj))
+                    self._track_files(content, touched_files, args_obj)
                     # Dynamic spinner text
                     name = content.get("name", "tool")
                     spinner.update(f"[bold blue]Executing {name}...[/]")
@@ -644,11 +734,10 @@ class SuperCoderREPL:
                     was_aborted = True
                     if is_streaming:
                         display_buffer = None
-                        accumulated_display = ""
-                        _printed_up_to = 0
+                        pending_display = ""
                         is_streaming = False
                     spinner.stop()
-                    reasoning_text = ""
+                    reasoning_parts.clear()
 
                 elif event_type == "rollback":
                     rollback_info = content
@@ -704,114 +793,109 @@ class SuperCoderREPL:
             self.agent.abort_controller.reset()
 
         # === Post-processing ===
+        renderables: list[RenderableType] = []
 
         # Display Abort notification
         if was_aborted:
-            self._print_block(
-                "[bold yellow]Agent execution was interrupted by user (ESC)[/]",
-                "Interrupted",
-                "yellow",
-                "⚠",
+            renderables.append(
+                self._build_block(
+                    "[bold yellow]Agent execution was interrupted by user (ESC)[/]",
+                    "Interrupted",
+                    "yellow",
+                    "⚠",
+                )
             )
 
         # Display Rollback info
         if rollback_info:
-            restored = rollback_info.get("restored", [])
-            failed = rollback_info.get("failed", [])
-            reason = rollback_info.get("reason", "Unknown")
-            rollback_lines = [f"[dim]Reason: {reason}[/]"]
-            rollback_lines.extend(f"  ✓ Restored: {f}" for f in restored)
-            rollback_lines.extend(f"  [red]✗ Failed: {f}[/]" for f in failed)
-            rollback_content = "\n".join(rollback_lines)
-            if failed:
-                self._print_block(rollback_content, "PARTIAL ROLLBACK", "yellow", "⚠")
-            else:
-                self._print_block(rollback_content, "Files Rolled Back", "cyan", "↩")
+            renderables.append(self._build_rollback_block(rollback_info))
 
         # Display Errors
-        for error in errors:
-            self._print_block(f"[red]{error}[/]", "Error", "red", "❌")
+        renderables.extend(
+            self._build_block(Text(str(error), style="red"), "Error", "red", "❌")
+            for error in errors
+        )
 
         # Display Status Footer
-        self._display_status_footer(touched_files)
-
-        self.console.print(Rule(style="dim grey50"))
+        renderables.append(self._build_status_footer(touched_files))
+        renderables.append(Rule(style="dim grey50"))
+        self.console.print(Group(*renderables))
 
-    def _track_files(self, tool_call, touched_files):
-        """Extract file paths from tool arguments to track active files."""
-        tool_call.get("name")
-        args = tool_call.get("arguments", {})
-
-        # Handle string args (sometimes args is a JSON string)
-        if isinstance(args, str):
-            try:
-                import json
+    def _track_files(self, tool_call, touched_files, args: dict | None = None):
+        """Extract file paths from tool arguments to track active files.
 
-                args = json.loads(args)
-            except Exception:
+        ``args`` is the already-decoded argument dict, when the caller has one.
+        """
+        if args is None:
+            args = self._tool_args_dict(tool_call.get("arguments", {}))
+            if args is None:
                 return
 
-        if not isinstance(args, dict):
-            return
-
         # Look for common file arguments
-        for key in [
-            "file",
-            "filepath",
-            "fileName",
-            "path",
-            "filename",
-            "target_file",
-            "source_file",
-        ]:
-            if key in args and isinstance(args[key], str):
-                from pathlib import Path
-
-                try:
-                    p = Path(args[key])
-                    # Store relative path if possible
-                    try:
-                        rel_path = p.relative_to(self.agent.repo_root)
-                        touched_files.add(str(rel_path))
-                    except ValueError:
-                        touched_files.add(p.name)
-                except Exception:
-                    pass
+        for key in _FILE_KEYS & args.keys():
+            value = args[key]
+            if isinstance(value, str) and value:
+                # Store the repo-relative path if possible, else the file name
+                if value.startswith(self._repo_root_prefix):
+                    touched_files.add(value[len(self._repo_root_prefix) :])
+                else:
+                    touched_files.add(os.path.basename(value.rstrip(os.sep)))
 
     def _display_status_footer(self, touched_files):
         """Display a status footer with the unified progress bar and active files."""
+        self.console.print(self._build_status_footer(touched_files))
+
+    def _build_status_footer(self, touched_files) -> RenderableType:
+        """Build the right-aligned status footer (context bar + active files)."""
         stats = self.agent.context.get_stats()
         bar = render.render_context_bar(
             stats.used_tokens, stats.total_tokens, width=theme.BAR_WIDTH_FOOTER
         )
+        bar.justify = "right"
         # render_context_bar already includes the "used/total tokens" label, so we
         # append the active-files segment separately with a separator.
         if touched_files:
             files_str = ", ".join(sorted(touched_files))
-            self.console.print(
-                Group(bar, Text(f"Active: {files_str}", style="dim")), justify="right"
-            )
-        else:
-            self.console.print(bar, justify="right")
+            return Group(bar, Text(f"Active: {files_str}", style="dim", justify="right"))
+        return bar
+
+    def _build_rollback_block(self, rollback_info: dict) -> Panel:
+        """Build the panel summarising files restored by a checkpoint rollback."""
+        restored = rollback_info.get("restored", [])
+        failed = rollback_info.get("failed", [])
+        reason = rollback_info.get("reason", "Unknown")
+        rollback_lines = [f"[dim]Reason: {reason}[/]"]
+        rollback_lines.extend(f"  ✓ Restored: {f}" for f in restored)
+        rollback_lines.extend(f"  [red]✗ Failed: {f}[/]" for f in failed)
+        rollback_content = "\n".join(rollback_lines)
+        if failed:
+            return self._build_block(rollback_content, "PARTIAL ROLLBACK", "yellow", "⚠")
+        return self._build_block(rollback_content, "Files Rolled Back", "cyan", "↩")
 
     def _render_session_history(self, messages: list) -> None:
         """Render session messages visually after restore.
 
-        Reuses the same rendering helpers as live output (_print_block,
-        _display_tool_call, _display_tool_result) to maintain visual fidelity.
-        Tool calls are interleaved with their matching tool results by tool_call_id.
+        Reuses the same builders as live output (_build_block,
+        _build_tool_call_panel, _build_tool_result_panel) to maintain visual
+        fidelity. Tool calls are interleaved with their matching tool results
+        by tool_call_id. The restored history is written with one console.print.
         """
-        import json
-
         MAX_TURNS = 6
+        model = self.agent.llm.config.model
 
         # Filter out system messages
         showable = [m for m in messages if m.role != "system"]
         to_show = self._tail_turn_groups(showable, MAX_TURNS)
 
+        renderables: list[RenderableType] = []
+
+        def add(renderable: RenderableType) -> None:
+            renderables.append(NewLine())
+            renderables.append(renderable)
+
         if len(showable) > len(to_show):
             skipped = len(showable) - len(to_show)
-            self.console.print(f"[dim]... {skipped} earlier messages not shown[/]\n")
+            renderables.append(Text(f"... {skipped} earlier messages not shown\n", style="dim"))
 
         # Build index: tool_call_id → position for fast lookup
         result_index: dict[str, int] = {}
@@ -830,23 +914,16 @@ class SuperCoderREPL:
             dt = msg.display_type
 
             if dt == "user_input":
-                self._print_output_spacer()
-                self.console.print(render.render_user_message(msg.content, live=False))
+                add(render.render_user_message(msg.content, live=False))
 
             elif dt == "thinking":
                 text = msg.content[:500] + ("..." if len(msg.content) > 500 else "")
-                self._print_output_spacer()
-                self.console.print(render.render_reasoning(text))
+                add(render.render_reasoning(text))
 
             elif dt in ("response", "tool_call"):
                 # Render text content
                 if msg.content and msg.content.strip():
-                    self._print_output_spacer()
-                    self.console.print(
-                        render.render_assistant_message(
-                            msg.content, model=self.agent.llm.config.model
-                        )
-                    )
+                    add(render.render_assistant_message(msg.content, model=model))
 
                 # Interleave: tool_call → matching tool_result
                 if msg.tool_calls:
@@ -856,72 +933,77 @@ class SuperCoderREPL:
                         args_str = fn.get("arguments", "{}")
                         try:
                             args_obj = (
-                                json.loads(args_str) if isinstance(args_str, str) else args_str
+                                _json_loads(args_str) if isinstance(args_str, str) else args_str
                             )
                         except Exception:
                             args_obj = {"_raw": args_str}
-                        self._print_output_spacer()
-                        self._display_tool_call({"name": name, "arguments": args_obj})
+                        add(self._build_tool_call_panel({"name": name, "arguments": args_obj}))
 
                         # Find and render matching tool result
                         tc_id = tc.get("id", "")
                         j = result_index.get(tc_id)
                         if j is not None and j not in consumed:
                             result_msg = to_show[j]
-                            self._print_output_spacer()
-                            self._display_tool_result(
-                                self._tool_result_payload_from_message(result_msg, name)
+                            add(
+                                self._build_tool_result_panel(
+                                    self._tool_result_payload_from_message(result_msg, name)
+                                )
                             )
                             consumed.add(j)
 
             elif dt == "tool_result":
                 # Only render if not already consumed by interleaving above
-                self._print_output_spacer()
-                self._display_tool_result(self._tool_result_payload_from_message(msg, "tool"))
+                add(
+                    self._build_tool_result_panel(
+                        self._tool_result_payload_from_message(msg, "tool")
+                    )
+                )
 
             elif dt == "error":
-                self._print_output_spacer()
                 if msg.role == "tool":
-                    self._display_tool_result(self._tool_result_payload_from_message(msg, "tool"))
+                    add(
+                        self._build_tool_result_panel(
+                            self._tool_result_payload_from_message(msg, "tool")
+                        )
+                    )
                 else:
-                    self._print_block(msg.content, "Error", "red", "❌")
+                    add(self._build_block(msg.content, "Error", "red", "❌"))
 
             elif dt == "compact_summary":
                 text = msg.content[:200]
-                self._print_output_spacer()
-                self._print_block(f"[dim]{text}...[/]", "Context Summary", "dim", "📋")
+                add(self._build_block(f"[dim]{text}...[/]", "Context Summary", "dim", "📋"))
 
             elif dt == "context_attachment":
-                self._print_output_spacer()
-                self._print_block(
-                    f"[dim]{summarize_attachment_content(msg.content)}[/]",
-                    "Attached Context",
-                    "cyan",
-                    "@",
+                add(
+                    self._build_block(
+                        f"[dim]{summarize_attachment_content(msg.content)}[/]",
+                        "Attached Context",
+                        "cyan",
+                        "@",
+                    )
                 )
 
             elif dt == "mode_policy":
-                self._print_output_spacer()
-                self.console.print(f"[dim]{msg.content}[/]")
+                add(f"[dim]{msg.content}[/]")
 
             else:
                 # Fallback for old sessions without display_type
                 if msg.role == "user" and msg.content:
-                    self._print_output_spacer()
-                    self.console.print(render.render_user_message(msg.content, live=False))
+                    add(render.render_user_message(msg.content, live=False))
                 elif msg.role == "assistant" and msg.content:
-                    self._print_output_spacer()
-                    self.console.print(
-                        render.render_assistant_message(
-                            msg.content, model=self.agent.llm.config.model
+                    add(render.render_assistant_message(msg.content, model=model))
+                elif msg.role == "tool":
+                    add(
+                        self._build_tool_result_panel(
+                            {"name": msg.name or "tool", "result": msg.content}
                         )
                     )
-                elif msg.role == "tool":
-                    self._print_output_spacer()
-                    self._display_tool_result({"name": msg.name or "tool", "result": msg.content})
 
             i += 1
 
+        if renderables:
+            self.console.print(Group(*renderables))
+
     def _tail_turn_groups(self, messages: list, max_turns: int) -> list:
         """Return the last complete user-turn groups for session restore."""
         groups: list[list] = []
@@ -963,8 +1045,8 @@ class SuperCoderREPL:
                 payload["display_result"] = msg.content
         return payload
 
-    def _print_block(self, content, title: str, color: str, icon: str = ""):
-        """Print content in a rounded panel (unified with the ui.render style).
+    def _build_block(self, content, title: str, color: str, icon: str = "") -> Panel:
+        """Build a rounded panel (unified with the ui.render style).
 
         Args:
             content: Rich renderable (Text, Markdown, Syntax, str)
@@ -972,13 +1054,25 @@ class SuperCoderREPL:
             color: Color for the border (e.g. "magenta", "yellow")
             icon: Optional emoji icon
         """
-        full_title = f"[bold {color}]{icon} {title}[/]" if icon else f"[bold {color}]{title}[/]"
-        self.console.print(Panel(content, title=full_title, border_style=color, box=box.ROUNDED))
+        key = (title, color, icon)
+        full_title = self._block_titles.get(key)
+        if full_title is None:
+            full_title = Text(f"{icon} {title}" if icon else title, style=f"bold {color}")
+            self._block_titles[key] = full_title
+        return Panel(content, title=full_title, border_style=color, box=box.ROUNDED)
+
+    def _print_block(self, content, title: str, color: str, icon: str = ""):
+        """Print content in a rounded panel (see ``_build_block``)."""
+        self.console.print(self._build_block(content, title, color, icon))
 
     def _print_output_spacer(self) -> None:
         """Separate consecutive agent outputs in terminal scrollback."""
         self.console.print()
 
+    def _print_spaced(self, renderable: RenderableType) -> None:
+        """Print a spacer line and ``renderable`` with a single console write."""
+        self.console.print(Group(NewLine(), renderable))
+
     def _display_context_attachment(self, summary: dict):
         """Display a compact summary of host-attached @path context."""
         self.console.print(f"[dim]{summarize_context_attachment(summary)}[/]")
@@ -1135,6 +1229,16 @@ class SuperCoderREPL:
         self.console.file.write(f"\x1b[{line_count}A\x1b[J")
         self.console.file.flush()
 
+    def _input_visual_lines(self, text: str, prompt_len: int, width: int) -> int:
+        """Count the terminal rows prompt_toolkit used to echo ``text``.
+
+        Each logical line wraps at ``width`` and takes at least one row; the
+        first one also holds the prompt.
+        """
+        lengths = [len(line) for line in text.split("\n")]
+        lengths[0] += prompt_len
+        return sum((n + width - 1) // width or 1 for n in lengths)
+
     def _terminal_line_count(self, rendered: str) -> int:
         """Count rendered terminal lines in captured Rich output."""
         plain = re.sub(r"\x1b\[[0-9;?]*[ -/]*[@-~]", "", rendered)
@@ -1344,18 +1448,41 @@ class SuperCoderREPL:
             return "wait"
 
     @staticmethod
-    def _strip_nested_json(prefix_pattern: str, text: str, flags: int = 0) -> str:
+    def _strip_delimited_blocks(text: str) -> str:
+        """Remove every complete opener...closer block in _TOOL_BLOCK_DELIMITERS.
+
+        The delimiters are fixed strings, so str.find locates them faster than
+        a regex scan. An opener without a closer is left in place.
+        """
+        for opener, closer in _TOOL_BLOCK_DELIMITERS:
+            start = text.find(opener)
+            if start == -1:
+                continue
+            kept = []
+            last = 0
+            while start != -1:
+                end = text.find(closer, start + len(opener))
+                if end == -1:
+                    break
+                kept.append(text[last:start])
+                last = end + len(closer)
+                start = text.find(opener, last)
+            if kept:
+                kept.append(text[last:])
+                text = "".join(kept)
+        return text
+
+    @staticmethod
+    def _strip_nested_json(prefix_pattern: re.Pattern[str], text: str) -> str:
         """Remove occurrences of prefix_pattern followed by a balanced {...} block.
 
         Unlike `{[^}]*}` regex, this handles nested braces and string literals
         correctly, so tool calls with code snippets in their arguments are fully
         stripped rather than leaving orphaned fragment text.
         """
-        import re
-
         result = []
         last = 0
-        for m in re.finditer(prefix_pattern, text, flags=flags):
+        for m in prefix_pattern.finditer(text):
             brace_start = m.end()
             # Skip whitespace between prefix and opening brace
             while brace_start < len(text) and text[brace_start] in " \t\n":
@@ -1395,60 +1522,68 @@ class SuperCoderREPL:
         return "".join(result)
 
     def _filter_special_tokens(self, text: str) -> str:
-        """Remove special tokens from display text while preserving normal content."""
-        import re
-
-        # Remove tool_code blocks: ```tool_code ... ```
-        text = re.sub(r"```tool_code\s*\n?.*?\n?```", "", text, flags=re.DOTALL)
-        # Remove our native tool call format: <@TOOL>...</@TOOL>
-        text = re.sub(r"<@TOOL>.*?</@TOOL>", "", text, flags=re.DOTALL)
-        # Remove GLM-style tool calls: <tool_call>...</tool_call>
-        text = re.sub(r"<tool_call>.*?</tool_call>", "", text, flags=re.DOTALL)
-        # Remove model-generated TOOL_RESULT blocks (model shouldn't generate these!)
-        text = re.sub(r"<@TOOL_RESULT>.*?</@TOOL_RESULT>", "", text, flags=re.DOTALL)
-        # Remove complete Qwen-style blocks: <|start|>...<|call|>
-        text = re.sub(r"<\|start\|>.*?<\|call\|>", "", text, flags=re.DOTALL)
-        # Remove gpt-oss format: <|channel|>...to=...<|message|>{...} (nested-brace-aware)
-        text = self._strip_nested_json(r"<\|channel\|>.*?<\|message\|>", text, flags=re.DOTALL)
+        """Remove special tokens from display text while preserving normal content.
+
+        Each pass is guarded by a substring probe for the literal its patterns
+        start with, so plain prose skips the regex work entirely.
+        """
+        has_marker = "<|" in text
+        if has_marker or "<@TOOL" in text or "<tool_call>" in text or "```tool_code" in text:
+            # Remove complete tool-call blocks (see _TOOL_BLOCK_DELIMITERS)
+            text = self._strip_delimited_blocks(text)
+            # Remove gpt-oss format: <|channel|>...to=...<|message|>{...} (nested-brace-aware)
+            text = self._strip_nested_json(_GPT_OSS_CALL_PREFIX, text)
+            has_marker = "<|" in text
         # Remove simple tool call format: to=tool.name {...} (nested-brace-aware)
-        text = self._strip_nested_json(
-            r"to=(?:tool[:\.]|TOOL\s+)[\w-]+\s*", text, flags=re.IGNORECASE
-        )
+        if any(probe in text for probe in _SIMPLE_CALL_PROBES):
+            text = self._strip_nested_json(_SIMPLE_CALL_PREFIX, text)
         # Remove any remaining special markers
-        text = re.sub(r"<\|[^|]+\|>", "", text)
+        if has_marker:
+            text = _SPECIAL_MARKER.sub("", text)
         # Collapse 3+ consecutive newlines to 2 (preserve paragraph breaks for Markdown).
         # Do NOT collapse \n\n → \n — that destroys Markdown paragraph structure.
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        if "\n\n\n" in text:
+            text = _EXCESS_NEWLINES.sub("\n\n", text)
         return text.strip()
 
     def _display_tool_call(self, tool_call):
         """Display tool call in a panel."""
-        name = tool_call.get("name")
-        args = tool_call.get("arguments")
+        self.console.print(self._build_tool_call_panel(tool_call))
+
+    @staticmethod
+    def _tool_args_dict(args) -> dict | None:
+        """Return tool-call arguments as a dict, decoding a JSON string.
 
-        # Parse args if string
+        None means the arguments are not a JSON object.
+        """
         if isinstance(args, str):
             try:
-                import json
-
-                args_obj = json.loads(args)
-                # Pretty print JSON args
-                args_str = json.dumps(args_obj, indent=2, ensure_ascii=False)
+                args = _json_loads(args)
             except Exception:
-                args_obj = {"_raw": args}
-                args_str = args
-        else:
-            import json
+                return None
+        return args if isinstance(args, dict) else None
 
-            args_obj = args if isinstance(args, dict) else {}
-            args_str = json.dumps(args, indent=2, ensure_ascii=False)
+    def _build_tool_call_panel(self, tool_call, args_obj: dict | None = None) -> RenderableType:
+        """Build the tool-call renderable: a one-line summary or a JSON args panel.
+
+        ``args_obj`` is the already-decoded argument dict, when the caller has one.
+        """
+        name = tool_call.get("name")
+        args = tool_call.get("arguments")
 
         if not getattr(self, "_show_agent_details", False):
+            if args_obj is None:
+                args_obj = self._tool_args_dict(args)
+            if args_obj is None:
+                args_obj = {"_raw": args} if isinstance(args, str) else {}
             icon = theme.TOOL_ICONS.get(name, theme.TOOL_ICON_DEFAULT)
-            self.console.print(f"[yellow]{icon} {self._tool_call_summary(name, args_obj)}[/]")
-            return
+            return Text(f"{icon} {self._tool_call_summary(name, args_obj)}", style="yellow")
+
+        # String args are already JSON text for Syntax to highlight; only
+        # structured args need serializing.
+        args_str = args if isinstance(args, str) else _json_pretty(args)
 
-        self._print_block(
+        return self._build_block(
             Syntax(
                 args_str,
                 "json",
@@ -1493,6 +1628,10 @@ class SuperCoderREPL:
 
     def _display_tool_result(self, result_data):
         """Display tool result in a panel with format-aware rendering."""
+        self.console.print(self._build_tool_result_panel(result_data))
+
+    def _build_tool_result_panel(self, result_data) -> RenderableType:
+        """Build the format-aware renderable for a tool result."""
         name = result_data.get("name")
         model_result = result_data.get("result", "")
         display_result = result_data.get("display_result")
@@ -1500,32 +1639,29 @@ class SuperCoderREPL:
         policy = result_data.get("display_policy")
 
         if policy == "error":
-            self._print_block(result, f"Error: {name}", "red", "❌")
-            return
+            return self._build_block(
+                Text(self._clip_display_text(str(result))), f"Error: {name}", "red", "❌"
+            )
 
         if policy == "hidden" and not getattr(self, "_show_agent_details", False):
             summary = result_data.get("display_summary") or f"{name} result hidden"
-            self.console.print(f"[dim]· {summary}[/]")
-            return
+            return Text(f"· {summary}", style="dim")
 
         if policy == "compact" and not getattr(self, "_show_agent_details", False):
-            self.console.print(f"[green]✔ {self._tool_result_summary(name, result_data)}[/]")
-            return
+            return Text(f"✔ {self._tool_result_summary(name, result_data)}", style="green")
 
         if (
             result_data.get("masked") or self._is_compacted_tool_output(model_result)
         ) and not getattr(self, "_show_agent_details", False):
-            self.console.print(f"[green]✔ {self._tool_result_summary(name, result_data)}[/]")
-            return
+            return Text(f"✔ {self._tool_result_summary(name, result_data)}", style="green")
 
         if result_data.get("masked") or self._is_compacted_tool_output(model_result):
-            self._display_large_tool_output_result(name, result_data, result, model_result)
-            return
+            return self._build_large_tool_output_panel(name, result_data, result, model_result)
 
         # Diff results (code-edit) — syntax-highlighted diff
-        if self._is_diff_result(result):
-            self._display_diff_result(name, result)
-            return
+        split_result = self._split_unified_diff_result(result)
+        if split_result is not None:
+            return self._build_diff_result_panel(name, *split_result)
 
         # File read — show with line numbers
         if name == "file-read" and result:
@@ -1537,8 +1673,7 @@ class SuperCoderREPL:
                 line_numbers=True,
                 background_color="default",
             )
-            self._print_block(syntax, f"Result: {name}", "green", "✔")
-            return
+            return self._build_block(syntax, f"Result: {name}", "green", "✔")
 
         # Command exec — show with shell highlighting
         if name == "command-exec" and result:
@@ -1550,12 +1685,11 @@ class SuperCoderREPL:
                 line_numbers=False,
                 background_color="default",
             )
-            self._print_block(syntax, f"Result: {name}", "green", "✔")
-            return
+            return self._build_block(syntax, f"Result: {name}", "green", "✔")
 
         # Default: truncated dim text
-        display_result = result[:500] + "..." if len(result) > 500 else result
-        self._print_block(f"[dim]{display_result}[/]", f"Result: {name}", "green", "✔")
+        display_result = result if len(result) <= 500 else result[:500] + "..."
+        return self._build_block(Text(display_result, style="dim"), f"Result: {name}", "green", "✔")
 
     def _tool_result_summary(self, name: str, result_data: dict) -> str:
         """Return a compact one-line summary for tool result rendering."""
@@ -1574,23 +1708,33 @@ class SuperCoderREPL:
 
     def _is_diff_result(self, result: str) -> bool:
         """Check if result contains unified diff format."""
-        return self._split_unified_diff_result(result) is not None
+        return self._unified_diff_offset(result) is not None
 
-    def _display_diff_result(self, name: str, result: str):
-        """Display a result containing diff with syntax highlighting."""
-        split_result = self._split_unified_diff_result(result)
-        if split_result is None:
-            self._print_block(f"[dim]{result}[/]", f"Result: {name}", "green", "✔")
-            return
-        message, diff_text = split_result
+    def _unified_diff_offset(self, result: str) -> int | None:
+        """Return the offset of the first real unified diff header, or None.
+
+        A header counts only when a hunk line ("@@") follows it. Checking the
+        first header is enough: any later one has even fewer lines after it.
+        """
+        if not result or "+++ " not in result or "@@" not in result:
+            return None
+        match = _DIFF_HEADER.search(result)
+        if match is None or result.find("\n@@", match.end()) == -1:
+            return None
+        return match.start()
+
+    def _build_diff_result_panel(self, name: str, message: str, diff_text: str) -> RenderableType:
+        """Build a split diff result (see ``_split_unified_diff_result``) with highlighting."""
+        parts: list[RenderableType] = []
 
         # Display message part (success message)
         if message:
-            self.console.print(f"[bold green]✔ {name}[/]: {message}")
+            message = self._clip_display_text(message)
+            parts.append(Text.assemble((f"✔ {name}", "bold green"), f": {message}"))
 
         # Display diff with syntax highlighting
         if diff_text:
-            diff_text = self._bounded_diff_text(diff_text)
+            diff_text = self._clip_display_text(self._bounded_diff_text(diff_text))
             syntax = Syntax(
                 diff_text,
                 "diff",
@@ -1598,32 +1742,15 @@ class SuperCoderREPL:
                 line_numbers=False,
                 background_color="default",
             )
-            self._print_block(syntax, "Changes", "cyan", "📝")
+            parts.append(self._build_block(syntax, "Changes", "cyan", "📝"))
+        return Group(*parts)
 
     def _split_unified_diff_result(self, result: str) -> tuple[str, str] | None:
         """Split a tool result into message and strict unified diff parts."""
-        if not result:
-            return None
-        lines = result.split("\n")
-        start = self._find_unified_diff_start(lines)
+        start = self._unified_diff_offset(result)
         if start is None:
             return None
-        message = "\n".join(lines[:start]).strip()
-        diff_text = "\n".join(lines[start:]).strip("\n")
-        return message, diff_text
-
-    def _find_unified_diff_start(self, lines: list[str]) -> int | None:
-        """Find a real unified diff header, not compact head/tail markers."""
-        for idx in range(len(lines) - 2):
-            if not lines[idx].startswith("--- "):
-                continue
-            if lines[idx].startswith("--- head") or lines[idx].startswith("--- tail"):
-                continue
-            if not lines[idx + 1].startswith("+++ "):
-                continue
-            if any(line.startswith("@@") for line in lines[idx + 2 :]):
-                return idx
-        return None
+        return result[:start].strip(), result[start:].strip("\n")
 
     def _bounded_diff_text(self, diff_text: str, max_lines: int = 260) -> str:
         """Keep very large diffs readable in terminal scrollback."""
@@ -1641,14 +1768,21 @@ class SuperCoderREPL:
             ]
         )
 
+    def _clip_display_text(self, text: str) -> str:
+        """Cut oversized tool output down before handing it to Rich."""
+        if len(text) <= _DISPLAY_TEXT_LIMIT:
+            return text
+        hidden = len(text) - _DISPLAY_TEXT_HEAD
+        return f"{text[:_DISPLAY_TEXT_HEAD]}\n... {hidden:,} more chars not shown ..."
+
     def _is_compacted_tool_output(self, result: str) -> bool:
         """Return True for model-facing compacted tool output payloads."""
         return result.startswith("[Tool output compacted]")
 
-    def _display_large_tool_output_result(
+    def _build_large_tool_output_panel(
         self, name: str, result_data: dict, display_result: str, model_result: str
-    ) -> None:
-        """Display a user-friendly large-output preview."""
+    ) -> Panel:
+        """Build a user-friendly large-output preview."""
         text = display_result
         if self._is_compacted_tool_output(model_result) and display_result == model_result:
             text = self._friendly_compacted_tool_output(model_result)
@@ -1671,7 +1805,7 @@ class SuperCoderREPL:
             word_wrap=True,
             background_color="default",
         )
-        self._print_block(Group(header, syntax), f"Result: {name}", "green", "✔")
+        return self._build_block(Group(header, syntax), f"Result: {name}", "green", "✔")
 
     def _friendly_compacted_tool_output(self, result: str) -> str:
         """Convert legacy model-facing compact output into user-facing text."""
@@ -1737,7 +1871,7 @@ class SuperCoderREPL:
         PromptStyle is built once at session setup and does not observe mode
         changes on its own.
         """
-        if not getattr(self, "session", None):
+        if self._session is None:
             return
         config = MODE_CONFIGS[self.agent.mode]
         from prompt_toolkit.styles import Style as PtStyle
@@ -1868,7 +2002,7 @@ class SuperCoderREPL:
         self.agent.abort_controller.reset()
         try:
             # Show spinner while compacting
-            with self.console.status("[bold blue]Compacting context...[/]", spinner="dots"):
+            with spinners.status(self.console, "[bold blue]Compacting context...[/]"):
                 summary, stats_before, stats_after = self.agent.compact_context()
         except AgentAbortedError:
             self._print_block(
@@ -2254,8 +2388,8 @@ class SuperCoderREPL:
         # Reset prompt_toolkit buffer to prevent double input issue
         # This clears any stale state that might cause the next input to be processed twice
         try:
-            if hasattr(self.session, "app") and self.session.app is not None:
-                self.session.app.current_buffer.reset()
+            if self._session is not None and getattr(self._session, "app", None) is not None:
+                self._session.app.current_buffer.reset()
         except Exception:
             pass  # Ignore if not in active input session
 
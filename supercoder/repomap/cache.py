@@ -0,0 +1,78 @@
+"""On-disk tag cache shared across RepoMap runs."""
+
+import hashlib
+import json
+from pathlib import Path
+
+from ..utils.atomic_writer import AtomicFileWriter
+
+# Bump when the stored entry format or the tree-sitter extraction rules change,
+# so entries written by an older release are discarded instead of misread.
+CACHE_VERSION = 1
+
+
+class TagCache:
+    """Persistent map from a file's language + content hash to its tags.
+
+    TagExtractor's in-memory cache only lives as long as the process; this one
+    lets a new session skip the tree-sitter parse of every unchanged file.
+    Entries hold ``(name, kind, line)`` without the path, so keying on content
+    alone is safe: a copied or moved file reuses its tags, and any edit misses.
+
+    Only entries read or stored since loading are written back, which keeps
+    the file bounded by the files of the most recent map.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._entries: dict[str, list] | None = None
+        self._used: set[str] = set()
+        self._dirty = False
+
+    @staticmethod
+    def key(lang: str, content: bytes) -> str:
+        """Return the cache key for ``content`` parsed as ``lang``."""
+        return f"{lang}:{hashlib.sha256(content).hexdigest()}"
+
+    def _load(self) -> dict[str, list]:
+        """Read the cache file once; a missing, corrupt or stale file is empty."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return self._entries
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                tags = data.get("tags")
+                if isinstance(tags, dict):
+                    self._entries = tags
+        return self._entries
+
+    def get(self, key: str) -> list | None:
+        """Return the cached ``[name, kind, line]`` entries for ``key``, or None."""
+        entries = self._load().get(key)
+        if entries is not None:
+            self._used.add(key)
+        return entries
+
+    def put(self, key: str, entries: list) -> None:
+        """Store ``[name, kind, line]`` entries for ``key``."""
+        self._load()[key] = entries
+        self._used.add(key)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if anything new was stored.
+
+        Raises:
+            OSError: If the write fails.
+        """
+        if not self._dirty:
+            return
+        entries = self._load()
+        data = {
+            "version": CACHE_VERSION,
+            "tags": {key: entries[key] for key in sorted(self._used) if key in entries},
+        }
+        AtomicFileWriter.write(self.path, json.dumps(data, separators=(",", ":")))
+        self._dirty = False
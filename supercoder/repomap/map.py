@@ -2,14 +2,28 @@
 
 import hashlib
 import json
+import os
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
 from ..logging import get_logger
-from ..tools.tool_utils import is_ignored_path
+from ..tools.tool_utils import IGNORE_DIRS, IGNORE_NAMES, is_ignored_path
 from ..utils.atomic_writer import AtomicFileWriter
+from .cache import TagCache
 from .tag_extractor import TagExtractor
 
+SOURCE_EXTENSIONS = frozenset({".py", ".scala", ".java", ".js", ".ts", ".go", ".rs"})
+
+
+def _is_ignored_name(name: str) -> bool:
+    """Apply is_ignored_path's per-component rules to a single entry name."""
+    return (
+        name in IGNORE_DIRS
+        or name in IGNORE_NAMES
+        or (name.startswith(".") and name != ".env.example")
+    )
+
 
 class RepoMap:
     """Generates a compact, cache-friendly map of the repository structure.
@@ -27,8 +41,8 @@ class RepoMap:
 
     def __init__(self, root: str | Path = "."):
         self.root = Path(root).resolve()
-        self.extractor = TagExtractor()
         self.storage_dir = self.root / ".supercoder" / "repomap"
+        self.extractor = TagExtractor(TagCache(self.storage_dir / "tags-cache.json"))
         # Content-hash cache for the rendered map.
         self._cache_key: str | None = None
         self._cached_map: str | None = None
@@ -64,6 +78,8 @@ class RepoMap:
             map_file = self.storage_dir / "repo_map.txt"
             AtomicFileWriter.write(map_file, repo_map)
             self._write_meta_sidecar(cache_key, len(files))
+            if self.extractor.tag_cache is not None:
+                self.extractor.tag_cache.save()
         except Exception as e:
             get_logger().log_error(e)
 
@@ -110,19 +126,37 @@ class RepoMap:
         """Get relevant source files in deterministic (sorted) order.
 
         Sorting is required for two reasons:
-        - rglob order depends on directory inode order and is not stable across
+        - Scan order depends on directory inode order and is not stable across
           runs, which would bust the LLM prefix cache on every call.
         - The 50-file cap below otherwise selects an arbitrary subset; a sorted
           selection is reproducible.
         """
-        source_extensions = {".py", ".scala", ".java", ".js", ".ts", ".go", ".rs"}
         files = []
-
-        for path in self.root.rglob("*"):
-            if is_ignored_path(path, self.root):
+        # Ignored directories (.git, node_modules, venvs, ...) are pruned before
+        # descending, rather than walked in full and filtered afterwards. An
+        # entry's parents were already checked, so its own name is enough.
+        pending = [str(self.root)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    entries = list(it)
+            except OSError:
                 continue
-            if path.is_file() and path.suffix in source_extensions:
-                files.append(path)
+            for entry in entries:
+                if _is_ignored_name(entry.name):
+                    continue
+                try:
+                    # Symlinked directories are not followed, as with rglob.
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif os.path.splitext(entry.name)[1] in SOURCE_EXTENSIONS and entry.is_file():
+                        path = Path(entry.path)
+                        # A symlink is judged by where it points, as before.
+                        if entry.is_symlink() and is_ignored_path(path, self.root):
+                            continue
+                        files.append(path)
+                except OSError:
+                    continue
 
         files.sort()
         # Limit total files for performance
@@ -134,22 +168,19 @@ class RepoMap:
             return ""
 
         # Group by file
-        by_file: dict[str, list] = {}
+        by_file: defaultdict[str, list] = defaultdict(list)
         for tag in tags:
-            if tag.file not in by_file:
-                by_file[tag.file] = []
             by_file[tag.file].append(tag)
 
         output = []
         total_tokens = 0
+        root = str(self.root)
 
         # Sort by file path for stable rendering order.
-        for file in sorted(by_file.keys()):
-            file_tags = by_file[file]
-            rel_path = Path(file).relative_to(self.root)
-            output.append(f"{rel_path}:")
+        for file in sorted(by_file):
+            output.append(f"{os.path.relpath(file, root)}:")
 
-            for tag in file_tags:
+            for tag in by_file[file]:
                 line = f"  {tag.name} {tag.kind}"
                 output.append(line)
 
@@ -1,11 +1,16 @@
 """Extract code structure using tree-sitter."""
 
+import bisect
 import hashlib
+import re
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+from .cache import TagCache
 
 try:
-    from tree_sitter_languages import get_parser
+    from tree_sitter_languages import get_language, get_parser
 
     HAS_TREE_SITTER = True
 except ImportError:
@@ -22,11 +27,30 @@ class Tag:
     line: int
 
 
+# Definition node types captured by each language's query. Grammars that lack
+# one of these simply leave it out of their query.
+_DEFINITION_TYPES = ("function_definition", "class_definition", "method_definition")
+
+# Regex fallback for files tree-sitter cannot parse, scanned over the whole
+# buffer at once. Whitespace excludes "\n" so a match never spans two lines.
+_FALLBACK_RE = re.compile(
+    r"^[^\S\n]*(?:(?P<cls>class|object|trait|struct)|(?P<fn>def|func|fn|function))"
+    r"[^\S\n]+(?P<name>\w+)",
+    re.MULTILINE,
+)
+
+
 class TagExtractor:
     """Extract tags from code files."""
 
-    def __init__(self):
+    def __init__(self, tag_cache: TagCache | None = None):
         self._cache = {}
+        # tree-sitter parser and compiled definition query per language, built
+        # on first use (query None: the grammar has no definition types).
+        self._parsers: dict[str, Any] = {}
+        self._queries: dict[str, Any] = {}
+        # Optional on-disk cache of tree-sitter results, shared across sessions.
+        self.tag_cache = tag_cache
 
     def extract(self, file_path: str) -> list[Tag]:
         """Extract tags from a file, cached by (path, mtime, size).
@@ -121,17 +145,35 @@ class TagExtractor:
         if not lang:
             return []
 
+        content = None
         try:
-            parser = get_parser(lang)
             content = Path(file_path).read_bytes()
+            tag_cache = self.tag_cache
+            cache_key = ""
+            if tag_cache is not None:
+                cache_key = tag_cache.key(lang, content)
+                cached = tag_cache.get(cache_key)
+                if cached is not None:
+                    return [Tag(name, kind, file_path, line) for name, kind, line in cached]
+
+            parser = self._parsers.get(lang)
+            if parser is None:
+                parser = self._parsers[lang] = get_parser(lang)
             tree = parser.parse(content)
 
             tags = []
-            self._visit_node(tree.root_node, file_path, tags)
+            for node in self._definition_nodes(lang, tree.root_node):
+                name = self._get_node_name(node)
+                if name:
+                    kind = "class" if "class" in node.type else "function"
+                    tags.append(Tag(name, kind, file_path, node.start_point[0] + 1))
+            if tag_cache is not None:
+                tag_cache.put(cache_key, [[t.name, t.kind, t.line] for t in tags])
             return tags
 
         except Exception:
-            return self._fallback_extract(file_path)
+            # Reuse the bytes already read, if any, rather than reopening.
+            return self._fallback_extract(file_path, content)
 
     def _detect_language(self, path: str) -> str | None:
         """Detect tree-sitter language from extension."""
@@ -150,23 +192,39 @@ class TagExtractor:
             ".php": "php",
         }.get(ext)
 
-    def _visit_node(self, node, file_path: str, tags: list[Tag]) -> None:
-        """Recursively visit nodes to find definitions."""
-        # This is a simplified traversal.
-        # A full implementation would use proper queries for each language.
-        # Here we rely on common node type names.
-
-        node_type = node.type
+    def _definition_query(self, lang: str):
+        """Return the compiled definition query for ``lang``, building it once.
 
-        if node_type in ("function_definition", "class_definition", "method_definition"):
-            name = self._get_node_name(node)
-            if name:
-                kind = "class" if "class" in node_type else "function"
-                tags.append(Tag(name, kind, file_path, node.start_point[0] + 1))
-
-        # Recurse
-        for child in node.children:
-            self._visit_node(child, file_path, tags)
+        A node type unknown to the grammar is a query syntax error, so each
+        type is probed on its own before joining the ones that compile.
+        """
+        if lang not in self._queries:
+            language = get_language(lang)
+            patterns = []
+            for node_type in _DEFINITION_TYPES:
+                pattern = f"({node_type}) @definition"
+                try:
+                    language.query(pattern)
+                except Exception:
+                    continue
+                patterns.append(pattern)
+            self._queries[lang] = language.query("\n".join(patterns)) if patterns else None
+        return self._queries[lang]
+
+    def _definition_nodes(self, lang: str, root) -> list:
+        """Return definition nodes under ``root`` in document order.
+
+        The query engine walks the tree in C, so only the matching nodes reach
+        Python instead of every node in the file.
+        """
+        query = self._definition_query(lang)
+        if query is None:
+            return []
+        captures = query.captures(root)
+        # py-tree-sitter returns (node, name) pairs before 0.23, a dict after.
+        if isinstance(captures, dict):
+            return captures.get("definition", [])
+        return [node for node, _ in captures]
 
     def _get_node_name(self, node) -> str | None:
         """Extract name from a definition node."""
@@ -178,25 +236,24 @@ class TagExtractor:
                 return self._get_node_name(child)
         return None
 
-    def _fallback_extract(self, file_path: str) -> list[Tag]:
-        """Simple regex-based extraction as fallback."""
-        import re
+    def _fallback_extract(self, file_path: str, data: bytes | None = None) -> list[Tag]:
+        """Simple regex-based extraction as fallback.
 
+        ``data`` is the file's content when the caller has already read it.
+        """
         tags = []
         try:
-            content = Path(file_path).read_text(errors="ignore")
-            lines = content.splitlines()
-
-            patterns = [
-                (r"^\s*(?:class|object|trait|struct)\s+(\w+)", "class"),
-                (r"^\s*(?:def|func|fn|function)\s+(\w+)", "function"),
-            ]
-
-            for i, line in enumerate(lines):
-                for pattern, kind in patterns:
-                    match = re.search(pattern, line)
-                    if match:
-                        tags.append(Tag(match.group(1), kind, file_path, i + 1))
+            if data is None:
+                content = Path(file_path).read_text(errors="ignore")
+            else:
+                content = data.decode("utf-8", errors="ignore")
+            line_starts = [0]
+            line_starts.extend(m.end() for m in re.finditer("\n", content))
+
+            for match in _FALLBACK_RE.finditer(content):
+                line = bisect.bisect_right(line_starts, match.start())
+                kind = "class" if match.group("cls") else "function"
+                tags.append(Tag(match.group("name"), kind, file_path, line))
         except Exception:
             pass
         return tags
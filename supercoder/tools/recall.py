@@ -144,6 +144,9 @@ class RecallTool(BaseTool):
         if not getattr(logger, "enabled", False):
             return []
         log_file = getattr(logger, "log_file", None)
+        flush = getattr(logger, "flush", None)
+        if callable(flush):
+            flush()  # Buffered stream events must be on disk before searching.
         return [log_file] if log_file and log_file.exists() else []
 
     def _no_logs_message(self, scope: str) -> str:
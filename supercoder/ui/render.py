@@ -10,6 +10,7 @@ migrates (see docs/ui-redesign-2026-08-03.md, Phase 3).
 from __future__ import annotations
 
 import json
+import re
 
 from rich import box
 from rich.markdown import Markdown
@@ -20,6 +21,15 @@ from rich.text import Text
 from ..mdstream import NoInsetMarkdown
 from . import theme
 
+# Anything the Markdown renderer would treat differently from plain text:
+# syntax characters, list numbers, soft line breaks (joined by Markdown),
+# runs of blank lines, and leading/trailing whitespace (stripped, or an
+# indented code block). Responses with none of these skip the parser.
+_MARKDOWN_SYNTAX = re.compile(
+    r"[#*_`\[\]<>|~\\&+=-]|^\d+[.)]|^[ \t]|[ \t\r]$|(?<!\n)\n(?!\n)|\n\n\n|\A\n|\n\Z",
+    re.MULTILINE,
+)
+
 # ---------------------------------------------------------------------------
 # Message-role renderers
 # ---------------------------------------------------------------------------
@@ -97,7 +107,10 @@ def render_assistant_message(
         header_parts.append((" · interrupted", "bold red"))
     title = Text.assemble(*header_parts)
 
-    body: Markdown | str = NoInsetMarkdown(content) if content else ""
+    body: Markdown | Text | str = ""
+    if content:
+        # Plain prose renders the same as Text, without a CommonMark parse.
+        body = NoInsetMarkdown(content) if _MARKDOWN_SYNTAX.search(content) else Text(content)
     return Panel(
         body,
         title=title,
@@ -58,6 +58,48 @@ def phase_spinner_name(phase: str) -> str:
     return SPINNER_BY_PHASE.get(phase, DEFAULT_SPINNER_NAME)
 
 
+# ---------------------------------------------------------------------------
+# Status factory
+# ---------------------------------------------------------------------------
+
+
+class NullStatus:
+    """No-op stand-in for ``rich.status.Status`` (same start/stop/update API).
+
+    Used when output is not a terminal: a real Status runs a Live refresh
+    thread that keeps re-rendering the spinner even though a pipe or log file
+    can never show it.
+    """
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def update(self, *args, **kwargs) -> None:
+        pass
+
+    def __enter__(self) -> NullStatus:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+def status(console, status_text, *, spinner: str = DEFAULT_SPINNER_NAME):
+    """Return ``console.status(...)``, or a NullStatus when not on a terminal.
+
+    The status redraws at the wave-gradient tick rate: the label never changes
+    faster than that, so Rich's default 12.5 fps only repaints identical text.
+    """
+    if not console.is_terminal:
+        return NullStatus()
+    return console.status(
+        status_text, spinner=spinner, refresh_per_second=theme.GRADIENT_REFRESH_PER_SECOND
+    )
+
+
 # ---------------------------------------------------------------------------
 # Wave-gradient loading text (Task 2.2)
 # ---------------------------------------------------------------------------
@@ -57,3 +57,19 @@ def test_context_reference_completion_replaces_only_at_token(tmp_path):
 
     assert completion.text == "@main.py"
     assert completion.start_position == -3
+
+
+def test_command_completion_matches_prefix_case_insensitively(tmp_path):
+    completer = AutoCompleter(
+        repo_root=tmp_path, commands=["/compact", "/clear", "/continue", "/stats", "/model"]
+    )
+
+    assert _completion_texts(completer, "/") == [
+        "/clear",
+        "/compact",
+        "/continue",
+        "/model",
+        "/stats",
+    ]
+    assert _completion_texts(completer, "/CO") == ["/compact", "/continue"]
+    assert _completion_texts(completer, "/x") == []
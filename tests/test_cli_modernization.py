@@ -1,3 +1,4 @@
+import json
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
@@ -24,6 +25,7 @@ class MockLLM:
             chunk_mock = MagicMock()
             chunk_mock.is_done = False
             chunk_mock.content = c
+            chunk_mock.reasoning = ""
             yield chunk_mock
 
         done_chunk = MagicMock()
@@ -116,6 +118,51 @@ def test_compact_resets_stale_abort_and_handles_abort():
     repl._print_block.assert_called_once()
 
 
+def test_repl_command_lookup_matches_first_word_only():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    repl = SuperCoderREPL(agent)
+
+    assert repl._lookup_command("/model gpt-4") == repl.cmd_model
+    assert repl._lookup_command("/HELP") == repl.cmd_help
+    assert repl._lookup_command("EXIT\nnow") == repl.cmd_exit
+    assert repl._lookup_command("quit") == repl.cmd_quit
+    assert repl._lookup_command("/unknown") is None
+    assert repl._lookup_command("explain /model please") is None
+    assert repl._lookup_command("exiting the loop early?") is None
+    assert repl._lookup_command("") is None
+    assert repl._lookup_command("   ") is None
+
+
+def test_repl_builds_prompt_session_on_first_use():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+
+    with patch.object(SuperCoderREPL, "_setup_session", return_value=MagicMock()) as setup:
+        repl = SuperCoderREPL(agent)
+        setup.assert_not_called()
+
+        session = repl.session
+        assert repl.session is session
+        setup.assert_called_once()
+
+
+def test_repl_prompt_history_loads_in_background(tmp_path):
+    from prompt_toolkit.history import FileHistory, ThreadedHistory
+
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.repo_root = tmp_path
+    repl = SuperCoderREPL(agent)
+
+    history = repl.session.history
+    assert isinstance(history, ThreadedHistory)
+    assert isinstance(history.history, FileHistory)
+
+
 def test_repl_cycle_mode_uses_shift_tab_order():
     """The REPL helper should cycle modes in the visible Shift+Tab order."""
     agent = MagicMock()
@@ -406,6 +453,20 @@ def test_tool_call_display_preserves_non_ascii_arguments():
     assert "\\u0420" not in rendered
 
 
+def test_tool_call_display_shows_string_arguments_verbatim():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.mode = AgentMode.CODE
+    repl = SuperCoderREPL(agent)
+    repl._show_agent_details = True
+    repl.console = Console(record=True, width=100)
+
+    repl._display_tool_call({"name": "test-tool", "arguments": '{"path":"a.py"}'})
+
+    assert '{"path":"a.py"}' in repl.console.export_text()
+
+
 def test_diff_detection_ignores_compacted_head_tail_markers():
     agent = MagicMock()
     agent.llm.model = "test"
@@ -450,6 +511,66 @@ def test_compacted_tool_output_is_rendered_as_user_friendly_preview():
     assert "TAIL" in rendered
 
 
+def test_diff_tool_result_is_built_without_printing():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.mode = AgentMode.CODE
+    repl = SuperCoderREPL(agent)
+    repl._show_agent_details = True
+    repl.console = Console(record=True, width=100)
+    result = {
+        "name": "code-edit",
+        "result": "Done\n\n--- old.py\n+++ new.py\n@@ -1 +1 @@\n-old\n+new",
+    }
+
+    panel = repl._build_tool_result_panel(result)
+    assert repl.console.export_text() == ""
+
+    repl._print_spaced(panel)
+    rendered = repl.console.export_text()
+    assert rendered.startswith("\n")
+    assert "code-edit" in rendered
+    assert "Changes" in rendered
+    assert "+new" in rendered
+
+
+def test_tool_result_brackets_are_not_parsed_as_markup():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.mode = AgentMode.CODE
+    repl = SuperCoderREPL(agent)
+    repl._show_agent_details = True
+    repl.console = Console(record=True, width=100)
+
+    repl._display_tool_result({"name": "custom", "result": "items[0] = [bold]x[/] [/red]"})
+    repl._display_tool_result(
+        {"name": "custom", "result": "bad [/] tag", "display_policy": "error"}
+    )
+
+    rendered = repl.console.export_text()
+    assert "items[0] = [bold]x[/] [/red]" in rendered
+    assert "bad [/] tag" in rendered
+
+
+def test_oversized_tool_error_is_clipped_before_rendering():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.mode = AgentMode.CODE
+    repl = SuperCoderREPL(agent)
+    repl.console = Console(record=True, width=100)
+    huge = "E" * 60_000 + "TAIL"
+
+    repl._display_tool_result({"name": "custom", "result": huge, "display_policy": "error"})
+
+    rendered = repl.console.export_text()
+    assert "more chars not shown" in rendered
+    assert "TAIL" not in rendered
+    assert rendered.count("E") < 5_000
+
+
 def test_display_result_is_preferred_for_masked_tool_output():
     agent = MagicMock()
     agent.llm.model = "test"
@@ -671,3 +792,171 @@ def test_tool_call_stream(mock_agent):
     # Let's simplify: Test `_extract_tool_call` independent logic
     tool_call = mock_agent._extract_tool_call(response_text)
     assert tool_call == {"name": "test_tool", "arguments": "arg"}
+
+
+def test_filter_special_tokens_strips_tool_markup():
+    repl = SuperCoderREPL(MagicMock())
+    text = (
+        "\n\nIntro.\n\n\n\n"
+        "```tool_code\nprint(1)\n```"
+        '<@TOOL>{"name": "x"}</@TOOL>'
+        "<tool_call>glm</tool_call>"
+        "<@TOOL_RESULT>fake</@TOOL_RESULT>"
+        "<|start|>assistant<|call|>"
+        '<|channel|>commentary to=functions.read<|message|>{"a": {"b": "}"}}'
+        'to=tool.search {"q": "x"}'
+        "<|end|>Outro."
+    )
+
+    assert repl._filter_special_tokens(text) == "Intro.\n\nOutro."
+
+
+def test_block_titles_are_built_once_per_title():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    repl = SuperCoderREPL(agent)
+
+    first = repl._build_block("a", "Tool Call: file-read", "yellow", "🔧")
+    second = repl._build_block("b", "Tool Call: file-read", "yellow", "🔧")
+
+    assert first.title is second.title
+    assert first.title.plain == "🔧 Tool Call: file-read"
+    assert repl._build_block("c", "Tool Call: [x]", "yellow").title.plain == "Tool Call: [x]"
+
+
+def test_streaming_prints_each_paragraph_once():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.tool_calling_type = "supercoder"
+    agent.context.get_stats.return_value = SimpleNamespace(used_tokens=10, total_tokens=100)
+    tokens = ["First para", "graph.\n", "\nSecond ", "paragraph.\n\n", "Third."]
+    agent.chat_stream.return_value = iter(
+        [{"type": "token", "content": token} for token in tokens] + [{"type": "done"}]
+    )
+    repl = SuperCoderREPL(agent)
+    repl.console = Console(record=True, width=100)
+
+    repl._handle_chat_streaming("hi")
+
+    rendered = repl.console.export_text()
+    for paragraph in ("First paragraph.", "Second paragraph.", "Third."):
+        assert rendered.count(paragraph) == 1
+    assert rendered.index("First") < rendered.index("Second") < rendered.index("Third")
+
+
+def test_streaming_flushes_completed_line_when_long_line_follows():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.tool_calling_type = "supercoder"
+    agent.context.get_stats.return_value = SimpleNamespace(used_tokens=10, total_tokens=100)
+    repl = SuperCoderREPL(agent)
+    repl.console = Console(record=True, width=100)
+    printed_at = []
+
+    def events():
+        tokens = ["intro line\n"] + ["x" * 10] * 200 + ["\nend"]
+        for index, token in enumerate(tokens):
+            if not printed_at and "intro line" in repl.console.export_text(clear=False):
+                printed_at.append(index)
+            yield {"type": "token", "content": token}
+        yield {"type": "done"}
+
+    agent.chat_stream.return_value = events()
+
+    repl._handle_chat_streaming("hi")
+
+    # The pending text passes 300 chars mid-line; the completed first line is
+    # printed then, not when the long line finally ends.
+    assert printed_at and printed_at[0] < 40
+    assert repl.console.export_text().count("intro line") == 1
+
+
+def test_session_history_restore_prints_once():
+    from supercoder.llm.base import Message
+
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    repl = SuperCoderREPL(agent)
+    repl.console = Console(record=True, width=100)
+    messages = [
+        Message("user", "read it", display_type="user_input"),
+        Message(
+            "assistant",
+            "Reading.",
+            display_type="tool_call",
+            tool_calls=[
+                {"id": "c1", "function": {"name": "file-read", "arguments": '{"path": "a.py"}'}}
+            ],
+        ),
+        Message("tool", "print('a')", tool_call_id="c1", display_type="tool_result"),
+        Message("assistant", "Done.", display_type="response"),
+    ]
+
+    with patch.object(repl.console, "print", wraps=repl.console.print) as console_print:
+        repl._render_session_history(messages)
+
+    console_print.assert_called_once()
+    text = repl.console.export_text()
+    assert text.index("read it") < text.index("file-read") < text.index("Done.")
+
+
+def test_input_visual_lines_counts_wrapped_rows():
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    repl = SuperCoderREPL(agent)
+
+    assert repl._input_visual_lines("hi", 5, 80) == 1
+    # Prompt plus text wraps onto a second row.
+    assert repl._input_visual_lines("x" * 78, 5, 80) == 2
+    # Empty lines still take a row each.
+    assert repl._input_visual_lines("a\n\nb", 5, 80) == 3
+    assert repl._input_visual_lines("a\n" + "y" * 160, 5, 80) == 3
+
+
+def test_track_files_keeps_repo_relative_paths(tmp_path):
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.repo_root = tmp_path
+    repl = SuperCoderREPL(agent)
+    touched: set[str] = set()
+
+    repl._track_files({"arguments": {"path": str(tmp_path / "src" / "app.py")}}, touched)
+    repl._track_files({"arguments": '{"fileName": "docs/guide.md"}'}, touched)
+    repl._track_files({"arguments": {"file": "/elsewhere/notes.txt"}}, touched)
+
+    assert touched == {"src/app.py", "guide.md", "notes.txt"}
+
+
+def test_tool_call_args_are_decoded_once(tmp_path):
+    agent = MagicMock()
+    agent.llm.model = "test"
+    agent.llm.config.model = "test"
+    agent.repo_root = tmp_path
+    repl = SuperCoderREPL(agent)
+    tool_call = {"name": "file-read", "arguments": '{"path": "a.py"}'}
+    touched: set[str] = set()
+
+    with patch("supercoder.repl._json_loads", wraps=json.loads) as loads:
+        args = repl._tool_args_dict(tool_call["arguments"])
+        panel = repl._build_tool_call_panel(tool_call, args)
+        repl._track_files(tool_call, touched, args)
+
+    assert loads.call_count == 1
+    assert "a.py" in panel.plain
+    assert touched == {"a.py"}
+
+
+def test_tool_args_json_helpers_match_stdlib():
+    from supercoder.repl import _json_loads, _json_pretty
+
+    args = {"path": "src/é.py", "lines": [1, 2], "opts": {}}
+    assert _json_pretty(args) == json.dumps(args, indent=2, ensure_ascii=False)
+    # orjson rejects these; the stdlib fallback keeps the old behavior.
+    assert _json_pretty({1: "a"}) == json.dumps({1: "a"}, indent=2)
+    assert _json_loads('{"n": NaN}')["n"] != 0
@@ -29,6 +29,38 @@ class TestTokenCounter:
         tokens = tc.count(code)
         assert tokens > 0
 
+    def test_count_messages_empty_list_is_zero(self):
+        """An empty message list costs nothing and skips serialization."""
+        tc = TokenCounter(use_tiktoken=True)
+        assert tc.count_messages([]) == 0
+
+    def test_count_messages_accepts_dicts_and_messages(self):
+        """Plain API dicts and Message objects count identically."""
+        tc = TokenCounter(use_tiktoken=True)
+        msg = Message("user", "Hello there")
+        assert tc.count_messages([msg]) == tc.count_messages([msg.to_api_dict()])
+
+    def test_short_texts_are_tokenized_once(self):
+        """Repeated short strings hit the memo; long strings are not stored."""
+        tc = TokenCounter(use_tiktoken=True)
+        encoder = tc.encoder
+        calls = []
+
+        class SpyEncoder:
+            def encode(self, text):
+                calls.append(text)
+                return encoder.encode(text)
+
+        tc.encoder = SpyEncoder()
+        short = "Error: file not found"
+        long = "word " * tc.SHORT_TEXT_MAX_CHARS
+
+        assert tc.count(short) == tc.count(short) == len(encoder.encode(short))
+        tc.count(long)
+        tc.count(long)
+
+        assert calls == [short, long, long]
+
     def test_tiktoken_availability(self):
         """Test that tiktoken-based counter reports accurate counting."""
         tc = TokenCounter(use_tiktoken=True)
@@ -358,3 +390,129 @@ class TestRepoMapStableMessage:
         msgs = cm.get_messages_for_api()
         # Only system + history; no empty repo-map message inserted.
         assert [m.role for m in msgs] == ["system", "user"]
+
+
+class TestIncrementalTokenAccounting:
+    """Fallback stats reuse per-message token counts instead of re-tokenizing."""
+
+    def _spy_raw(self, counter):
+        calls = {"n": 0}
+        original = counter._count_raw
+
+        def counting(text):
+            calls["n"] += 1
+            return original(text)
+
+        counter._count_raw = counting
+        return calls
+
+    def test_count_message_is_memoized_on_message(self):
+        tc = TokenCounter(use_tiktoken=True)
+        msg = Message("user", "Hello there, this is cached")
+        first = tc.count_message(msg)
+        calls = self._spy_raw(tc)
+
+        assert tc.count_message(msg) == first
+        assert calls["n"] == 0
+
+    def test_payload_estimate_never_undercounts_joined_payload(self):
+        tc = TokenCounter(use_tiktoken=True)
+        messages = [
+            Message("system", "System prompt"),
+            Message("user", "Read file", display_type="user_input"),
+            Message(
+                "assistant",
+                "",
+                tool_calls=[
+                    {
+                        "id": "c1",
+                        "type": "function",
+                        "function": {"name": "file-read", "arguments": '{"fileName":"a.py"}'},
+                    }
+                ],
+            ),
+            Message("tool", "print('hi')", tool_call_id="c1", name="file-read"),
+        ]
+        joined = tc.count_serialized({"messages": [m.to_api_dict() for m in messages]})
+        estimate = tc.count_api_payload(messages)
+
+        assert joined <= estimate <= joined * 1.1
+
+    def test_stats_do_not_retokenize_history(self):
+        cm = ContextWindowManager(ContextConfig(max_tokens=100000))
+        cm.set_system_prompt("System")
+        for i in range(20):
+            cm.add_message(Message("user", f"Message {i}: some content"))
+        cm.get_stats()
+        calls = self._spy_raw(cm.counter)
+
+        cm.get_stats()
+        cm.add_message(Message("assistant", "One more"))
+        cm.get_stats()
+
+        # Only the newly added message is tokenized.
+        assert calls["n"] == 1
+
+    def test_running_total_matches_recount_after_history_changes(self):
+        cm = ContextWindowManager(ContextConfig(max_tokens=100000, min_messages_to_keep=2))
+        for i in range(10):
+            cm.add_message(Message("user", f"Message {i} " * 20))
+        cm.add_message(Message("assistant", "thinking", display_type="thinking"))
+        running = cm._api_history_tokens()
+
+        cm._history_tokens = None
+        assert cm._api_history_tokens() == running
+
+        cm.config.max_tokens = 300
+        cm.force_compress()
+        running = cm._api_history_tokens()
+        cm._history_tokens = None
+        assert cm._api_history_tokens() == running
+
+    def test_sliding_compress_drops_oldest_without_retokenizing(self):
+        cm = ContextWindowManager(ContextConfig(max_tokens=400, min_messages_to_keep=2))
+        for i in range(30):
+            cm.add_message(Message("user", f"Message {i} " * 10))
+        calls = self._spy_raw(cm.counter)
+
+        cm._sliding_window_compress()
+
+        assert calls["n"] == 0
+        assert cm.history[-1].content.startswith("Message 29")
+        assert cm.get_stats().used_tokens <= 200
+        assert cm._api_history_tokens() == sum(cm.counter.count_message(m) for m in cm.history)
+
+    def test_api_messages_track_history_changes(self):
+        cm = ContextWindowManager(ContextConfig(max_tokens=400, min_messages_to_keep=2))
+        cm.set_system_prompt("System")
+
+        def expected():
+            return [m for m in cm.history if m.display_type != "thinking"]
+
+        for i in range(30):
+            cm.add_message(Message("user", f"Message {i} " * 10))
+            cm.add_message(Message("assistant", "hmm", display_type="thinking"))
+        assert cm.get_messages_for_api()[1:] == expected()
+
+        cm._sliding_window_compress()
+        assert cm.get_messages_for_api()[1:] == expected()
+
+        cm.history = cm.history[-3:]
+        cm.add_message(Message("assistant", "after replace"))
+        assert cm.get_messages_for_api()[1:] == expected()
+
+        cm.clear()
+        assert len(cm.get_messages_for_api()) == 1
+
+    def test_threshold_checks_do_not_build_stats(self, monkeypatch):
+        cm = ContextWindowManager(ContextConfig(max_tokens=1000))
+        for i in range(10):
+            cm.add_message(Message("user", f"Message {i} " * 20))
+
+        def fail():
+            raise AssertionError("get_stats should not be called")
+
+        monkeypatch.setattr(cm, "get_stats", fail)
+        cm.should_auto_compact()
+        cm.should_emergency_compress()
+        cm.estimate_response_fit(100)
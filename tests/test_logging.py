@@ -232,3 +232,68 @@ def test_log_edit_confirmation_event_without_file_content(tmp_path, monkeypatch)
     assert event["approved"] is True
     assert event["decision"] == "apply_and_accept_edits"
     assert "content" not in event
+
+
+def test_stream_events_are_batched_until_flush(tmp_path, monkeypatch):
+    monkeypatch.setattr(logging_mod, "LOG_DIR", tmp_path)
+
+    logger = logging_mod.ConversationLogger("model", enabled=True)
+    logger.log_stream_event("token", "chunk-1")
+    log_file = next(tmp_path.glob("*.jsonl"))
+    assert "chunk-1" not in log_file.read_text()
+
+    logger.log_user_input("next prompt")
+    text = log_file.read_text()
+    assert "chunk-1" in text and "next prompt" in text
+
+    for i in range(logging_mod._FLUSH_EVERY):
+        logger.log_stream_event("token", f"burst-{i}")
+    assert f"burst-{logging_mod._FLUSH_EVERY - 1}" in log_file.read_text()
+
+    logger.log_stream_event("token", "tail")
+    logger.close()
+    assert log_file.read_text().count("\n") == logging_mod._FLUSH_EVERY + 4
+
+
+def test_close_waits_for_an_in_progress_write(tmp_path, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(logging_mod, "LOG_DIR", tmp_path)
+    logger = logging_mod.ConversationLogger("model", enabled=True)
+    fh = logger._fh
+    assert fh is not None
+
+    # Hold the lock as _write_entry does; close() must not swap the handle.
+    with logger._lock:
+        closer = threading.Thread(target=logger._drop_handle)
+        closer.start()
+        closer.join(timeout=0.1)
+        assert closer.is_alive()
+        assert logger._fh is fh and not fh.closed
+    closer.join(timeout=5)
+
+    assert logger._fh is None and fh.closed
+
+
+def test_timestamp_matches_datetime_isoformat():
+    from datetime import datetime
+
+    before = datetime.now()
+    stamp = logging_mod._timestamp()
+    after = datetime.now()
+
+    parsed = datetime.fromisoformat(stamp)
+    assert before.replace(microsecond=0) <= parsed <= after
+    assert len(stamp) in (19, 26)
+
+
+def test_encode_entry_writes_utf8_json_line(monkeypatch):
+    entry = {"type": "user", "content": "héllo ✓", "n": 2**70}
+    encoded = logging_mod._encode_entry(entry)
+
+    assert encoded.endswith(b"\n")
+    assert json.loads(encoded.decode("utf-8")) == entry
+    assert "héllo ✓".encode() in encoded
+
+    monkeypatch.setattr(logging_mod, "HAS_ORJSON", False)
+    assert json.loads(logging_mod._encode_entry(entry)) == entry
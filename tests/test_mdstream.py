@@ -0,0 +1,41 @@
+"""Tests for the legacy streaming markdown renderer."""
+
+import io
+
+from rich.console import Console
+
+from supercoder import mdstream
+
+
+class _FakeLive:
+    def __init__(self, *args, **kwargs):
+        self.console = Console(file=io.StringIO())
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def update(self, renderable):
+        pass
+
+
+def test_incremental_stream_matches_full_render(monkeypatch):
+    monkeypatch.setattr(mdstream, "Live", _FakeLive)
+    doc = "".join(
+        f"## Section {i}\n\nParagraph {i} with **bold** text.\n\n"
+        f"- item a\n- item b\n\n  continued\n\n"
+        f"```python\ndef f{i}():\n\n    return {i}\n```\n\n"
+        for i in range(15)
+    )
+
+    stream = mdstream.MarkdownStream()
+    stream.min_delay = 0
+    for end in range(40, len(doc), 40):
+        stream.when = 0
+        stream.update(doc[:end])
+    assert stream._stable_source_offset > len(doc) // 2
+    stream.update(doc, final=True)
+
+    assert stream.printed == stream._render_markdown_to_lines(doc)
@@ -150,6 +150,20 @@ class TestMessageSerialization:
         d = msg.to_api_dict()
         assert "name" not in d
 
+    def test_api_dict_is_cached_until_a_payload_field_changes(self):
+        msg = Message(role="user", content="Hi")
+        first = msg.api_dict
+        assert first == msg.to_api_dict()
+        assert msg.api_dict is first
+
+        msg.display_type = "user_input"
+        assert msg.api_dict is first
+
+        msg._token_counts["cl100k_base"] = 5
+        msg.content = "Hello"
+        assert msg.api_dict == {"role": "user", "content": "Hello"}
+        assert msg._token_counts == {}
+
 
 # ──────────────────────────────────────────────
 # CompletionResult / NativeToolCall
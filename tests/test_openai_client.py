@@ -2,7 +2,7 @@
 
 from types import SimpleNamespace
 
-from supercoder.config import Config
+from supercoder.config import Config, ModelProfile
 from supercoder.llm.base import Message
 from supercoder.llm.openai_client import OpenAIClient
 
@@ -53,3 +53,34 @@ def test_interruptible_chat_with_tools_passes_top_p(monkeypatch):
     client.chat_with_tools_interruptible([Message("user", "hello")])
 
     assert fake_client.chat.completions.calls[0]["top_p"] == 0.4
+
+
+def test_switch_model_reuses_client_per_endpoint(monkeypatch):
+    created = []
+
+    def make_client(**kwargs):
+        created.append(kwargs)
+        return FakeOpenAI(None)
+
+    monkeypatch.setattr("supercoder.llm.openai_client.OpenAI", make_client)
+    config = Config(api_key="test", base_url="https://a.example/v1")
+    client = OpenAIClient(config)
+    original = client.client
+
+    other = ModelProfile(name="other", model="m2", api_key="k2", endpoint="https://b.example/v1")
+    client.switch_model(other)
+    assert client.client is not original
+
+    same_as_config = ModelProfile(
+        name="back",
+        model="m1",
+        api_key="test",
+        endpoint="https://a.example/v1",
+        request_timeout=config.request_timeout,
+    )
+    client.switch_model(same_as_config)
+    client.switch_model(other)
+    client.switch_model(same_as_config)
+
+    assert client.client is original
+    assert len(created) == 2
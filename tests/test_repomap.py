@@ -83,3 +83,139 @@ def main():
         assert source_file in files
         assert checkpoint_file not in files
         assert venv_file not in files
+
+    def test_repomap_skips_symlinks_into_ignored_dirs(self, tmp_path):
+        """A symlinked source file is judged by its target, like rglob was."""
+        vendored = tmp_path / "node_modules" / "pkg"
+        vendored.mkdir(parents=True)
+        (vendored / "index.js").write_text("function vendored() {}")
+        (tmp_path / "index.js").symlink_to(vendored / "index.js")
+        (tmp_path / "linked_dir").symlink_to(vendored, target_is_directory=True)
+        source_file = tmp_path / "app.py"
+        source_file.write_text("def visible_app(): pass")
+
+        files = RepoMap(tmp_path)._get_files()
+
+        assert files == [source_file]
+
+
+class TestDefinitionQuery:
+    """TagExtractor compiles one definition query per language."""
+
+    def test_query_skips_node_types_missing_from_grammar(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from supercoder.repomap import tag_extractor
+
+        def query(pattern):
+            if pattern == "(method_definition) @definition":
+                raise NameError("Invalid node type method_definition")
+            return SimpleNamespace(pattern=pattern)
+
+        language = SimpleNamespace(query=query)
+        monkeypatch.setattr(tag_extractor, "get_language", lambda _lang: language, raising=False)
+        extractor = tag_extractor.TagExtractor()
+
+        query_obj = extractor._definition_query("python")
+
+        assert extractor._definition_query("python") is query_obj
+        assert query_obj.pattern == (
+            "(function_definition) @definition\n(class_definition) @definition"
+        )
+
+    def test_parser_is_created_once_per_language(self, tmp_path, monkeypatch):
+        from types import SimpleNamespace
+
+        from supercoder.repomap import tag_extractor
+
+        created = []
+
+        def get_parser(lang):
+            created.append(lang)
+            return SimpleNamespace(parse=lambda _content: SimpleNamespace(root_node=None))
+
+        language = SimpleNamespace(
+            query=lambda _pattern: SimpleNamespace(captures=lambda _root: [])
+        )
+        monkeypatch.setattr(tag_extractor, "HAS_TREE_SITTER", True)
+        monkeypatch.setattr(tag_extractor, "get_parser", get_parser, raising=False)
+        monkeypatch.setattr(tag_extractor, "get_language", lambda _lang: language, raising=False)
+        extractor = tag_extractor.TagExtractor()
+
+        for name in ("a.py", "b.py", "c.go"):
+            (tmp_path / name).write_text("x = 1\n")
+            extractor.extract(str(tmp_path / name))
+
+        assert created == ["python", "go"]
+
+    def test_parse_failure_falls_back_without_rereading(self, tmp_path, monkeypatch):
+        from pathlib import Path
+
+        from supercoder.repomap import tag_extractor
+
+        def broken_parser(_lang):
+            raise RuntimeError("grammar unavailable")
+
+        def no_reread(*_args, **_kwargs):
+            raise AssertionError("fallback re-read the file")
+
+        monkeypatch.setattr(tag_extractor, "HAS_TREE_SITTER", True)
+        monkeypatch.setattr(tag_extractor, "get_parser", broken_parser, raising=False)
+        monkeypatch.setattr(Path, "read_text", no_reread)
+        source = tmp_path / "mod.py"
+        source.write_bytes("class Café:\n    def brew(self): pass\n".encode())
+
+        tags = tag_extractor.TagExtractor().extract(str(source))
+
+        assert [(t.name, t.kind, t.line) for t in tags] == [
+            ("Café", "class", 1),
+            ("brew", "function", 2),
+        ]
+
+    def test_fallback_reports_lines_and_skips_split_keywords(self):
+        from supercoder.repomap.tag_extractor import TagExtractor
+
+        source = b"\r\nstruct Point {}\r\n\r\n  fn area() {}\nclass\nNotATag\n"
+
+        tags = TagExtractor()._fallback_extract("shapes.rs", source)
+
+        assert [(t.name, t.kind, t.line) for t in tags] == [
+            ("Point", "class", 2),
+            ("area", "function", 4),
+        ]
+
+    def test_query_matches_real_python_grammar(self, tmp_path, monkeypatch):
+        import pytest
+
+        from supercoder.repomap import tag_extractor
+
+        try:
+            parser = tag_extractor.get_parser("python")
+        except Exception:
+            # Not installed, or a tree_sitter release it cannot load.
+            pytest.skip("tree_sitter_languages python grammar unavailable")
+
+        source = tmp_path / "shapes.py"
+        source.write_bytes(
+            b"class Shape:\n    def area(self):\n        pass\n\n\ndef build():\n    pass\n"
+        )
+        extractor = tag_extractor.TagExtractor()
+        root = parser.parse(source.read_bytes()).root_node
+
+        nodes = extractor._definition_nodes("python", root)
+
+        assert [(n.type, n.start_point[0] + 1) for n in nodes] == [
+            ("class_definition", 1),
+            ("function_definition", 2),
+            ("function_definition", 6),
+        ]
+
+        def no_fallback(*_args):
+            raise AssertionError("tree-sitter path fell back to regex")
+
+        monkeypatch.setattr(extractor, "_fallback_extract", no_fallback)
+        assert [(t.name, t.kind, t.line) for t in extractor.extract(str(source))] == [
+            ("Shape", "class", 1),
+            ("area", "function", 2),
+            ("build", "function", 6),
+        ]
@@ -297,3 +297,73 @@ class TestTagExtractorStaleCache:
         os.utime(f, ns=(fill_mtime_ns, fill_mtime_ns))
         names = [t.name for t in extractor.extract(str(f))]
         assert "renamed_longer" in names
+
+
+class TestPersistentTagCache:
+    """Tree-sitter results persist across RepoMap instances (new sessions)."""
+
+    @staticmethod
+    def _fake_tree_sitter(monkeypatch, calls):
+        """Install a parser and language whose trees hold one function each."""
+        from types import SimpleNamespace
+
+        def node(type_, children=(), text=b"", line=0):
+            return SimpleNamespace(
+                type=type_, children=list(children), text=text, start_point=(line, 0)
+            )
+
+        def parse(content):
+            calls.append(content)
+            name = content.split(b"def ", 1)[1].split(b"(", 1)[0]
+            func = node("function_definition", [node("identifier", text=name)])
+            return SimpleNamespace(root_node=node("module", [func]))
+
+        def captures(root):
+            return [(child, "definition") for child in root.children]
+
+        language = SimpleNamespace(query=lambda _pattern: SimpleNamespace(captures=captures))
+        module = "supercoder.repomap.tag_extractor"
+        monkeypatch.setattr(f"{module}.HAS_TREE_SITTER", True)
+        monkeypatch.setattr(
+            f"{module}.get_parser", lambda _lang: SimpleNamespace(parse=parse), raising=False
+        )
+        monkeypatch.setattr(f"{module}.get_language", lambda _lang: language, raising=False)
+
+    def test_new_session_reuses_tags_without_parsing(self, tmp_path, monkeypatch):
+        calls = []
+        self._fake_tree_sitter(monkeypatch, calls)
+        (tmp_path / "a.py").write_text("def alpha(): pass\n")
+
+        first = RepoMap(tmp_path).get_repo_map(max_tokens=2048)
+        assert len(calls) == 1
+        assert (tmp_path / ".supercoder" / "repomap" / "tags-cache.json").exists()
+
+        second = RepoMap(tmp_path).get_repo_map(max_tokens=2048)
+        assert second == first
+        assert "alpha" in second
+        assert len(calls) == 1
+
+    def test_edited_file_is_reparsed(self, tmp_path, monkeypatch):
+        calls = []
+        self._fake_tree_sitter(monkeypatch, calls)
+        source = tmp_path / "a.py"
+        source.write_text("def alpha(): pass\n")
+        RepoMap(tmp_path).get_repo_map(max_tokens=2048)
+
+        source.write_text("def bravo(): pass\n")
+        content = RepoMap(tmp_path).get_repo_map(max_tokens=2048)
+
+        assert len(calls) == 2
+        assert "bravo" in content
+        assert "alpha" not in content
+
+    def test_stale_cache_version_is_ignored(self, tmp_path):
+        import json
+
+        from supercoder.repomap.cache import CACHE_VERSION, TagCache
+
+        path = tmp_path / "tags-cache.json"
+        key = TagCache.key("python", b"def alpha(): pass\n")
+        path.write_text(json.dumps({"version": CACHE_VERSION - 1, "tags": {key: []}}))
+
+        assert TagCache(path).get(key) is None
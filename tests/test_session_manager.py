@@ -126,8 +126,9 @@ class TestSessionManager:
 
         manager.save_session(session)
 
-        assert calls
-        assert calls[0][0] == manager._get_session_path(session.id)
+        written = [path for path, _ in calls]
+        assert manager._get_session_path(session.id) in written
+        assert manager._get_log_path(session.id) in written
 
     def test_update_session_after_compact_uses_atomic_writer(self, tmp_path, monkeypatch):
         """Compacted session JSON is written through AtomicFileWriter."""
@@ -146,8 +147,9 @@ class TestSessionManager:
 
         manager.update_session_after_compact(session, "Summary")
 
-        assert calls
-        assert calls[0][0] == manager._get_session_path(session.id)
+        written = [path for path, _ in calls]
+        assert manager._get_session_path(session.id) in written
+        assert manager._get_log_path(session.id) in written
 
     def test_save_session_updates_title(self, tmp_path):
         """Test that saving updates title from last user message."""
@@ -198,6 +200,29 @@ class TestSessionManager:
         assert "title" in sessions[0]
         assert "last_modified" in sessions[0]
 
+    def test_list_sessions_reuses_unchanged_headers(self, tmp_path, monkeypatch):
+        """Unchanged session headers are not re-parsed; rewritten ones are."""
+        import json
+
+        manager = SessionManager(tmp_path)
+        session = manager.create_new_session()
+        session.messages = [Message("user", "First")]
+        manager.save_session(session)
+        manager.list_sessions()
+
+        loads = []
+        real_load = json.load
+        monkeypatch.setattr(json, "load", lambda f: loads.append(f.name) or real_load(f))
+
+        assert manager.list_sessions()[0]["title"] == "First"
+        assert loads == []
+
+        session.messages.append(Message("user", "Second"))
+        manager.save_session(session)
+        sessions = manager.list_sessions()
+        assert sessions[0]["title"] == "Second"
+        assert sessions[0]["message_count"] == 2
+
     def test_delete_session(self, tmp_path):
         """Test deleting a session."""
         manager = SessionManager(tmp_path)
@@ -278,6 +303,114 @@ class TestSessionManager:
         assert loaded.messages[0].display_type == "compact_summary"
         assert loaded.messages[1].content == "Recent exact step"
 
+    def test_save_session_appends_only_new_messages(self, tmp_path, monkeypatch):
+        """A follow-up save appends the new tail instead of rewriting the log."""
+        from supercoder.context import session_manager
+
+        manager = SessionManager(tmp_path)
+        session = manager.create_new_session()
+        session.messages = [Message("user", "Hello"), Message("assistant", "Hi!")]
+        manager.save_session(session)
+
+        calls = []
+        original_write = session_manager.AtomicFileWriter.write
+
+        def spy(path, content, encoding="utf-8"):
+            calls.append(path)
+            return original_write(path, content, encoding)
+
+        monkeypatch.setattr(session_manager.AtomicFileWriter, "write", spy)
+
+        session.messages = [*session.messages, Message("user", "Next"), Message("assistant", "Ok")]
+        manager.save_session(session)
+
+        assert calls == [manager._get_session_path(session.id)]
+        log_lines = manager._get_log_path(session.id).read_text().splitlines()
+        assert len(log_lines) == 4
+        loaded = manager.load_session(session.id)
+        assert [m.content for m in loaded.messages] == ["Hello", "Hi!", "Next", "Ok"]
+
+    def test_save_session_rewrites_log_when_history_changes(self, tmp_path):
+        """Dropping old messages (compression) rewrites the log instead of appending."""
+        manager = SessionManager(tmp_path)
+        session = manager.create_new_session()
+        session.messages = [Message("user", f"m{i}") for i in range(4)]
+        manager.save_session(session)
+
+        session.messages = [*session.messages[2:], Message("user", "m4")]
+        manager.save_session(session)
+
+        loaded = manager.load_session(session.id)
+        assert [m.content for m in loaded.messages] == ["m2", "m3", "m4"]
+        assert len(manager._get_log_path(session.id).read_text().splitlines()) == 3
+
+    def test_load_ignores_log_lines_beyond_header_count(self, tmp_path):
+        """A save interrupted after appending but before the header is ignored."""
+        manager = SessionManager(tmp_path)
+        session = manager.create_new_session()
+        session.messages = [Message("user", "Hello")]
+        manager.save_session(session)
+
+        with open(manager._get_log_path(session.id), "a", encoding="utf-8") as f:
+            f.write('{"role": "assistant", "content": "half-writ')
+
+        loaded = manager.load_session(session.id)
+        assert [m.content for m in loaded.messages] == ["Hello"]
+
+        # The next save must not append after the stale partial line.
+        loaded.messages = [*loaded.messages, Message("assistant", "Hi!")]
+        manager.save_session(loaded)
+        reloaded = manager.load_session(session.id)
+        assert [m.content for m in reloaded.messages] == ["Hello", "Hi!"]
+
+    def test_load_legacy_single_file_session(self, tmp_path):
+        """Sessions saved with messages inlined in <id>.json still load and migrate."""
+        import json
+
+        manager = SessionManager(tmp_path)
+        legacy = {
+            "id": "legacy01",
+            "title": "Old",
+            "created_at": "",
+            "last_modified": "",
+            "is_compacted": False,
+            "messages": [{"role": "user", "content": "Old message"}],
+        }
+        manager._get_session_path("legacy01").write_text(json.dumps(legacy))
+
+        assert manager.list_sessions()[0]["message_count"] == 1
+        loaded = manager.load_session("legacy01")
+        assert [m.content for m in loaded.messages] == ["Old message"]
+
+        loaded.messages = [*loaded.messages, Message("assistant", "New reply")]
+        manager.save_session(loaded)
+        reloaded = manager.load_session("legacy01")
+        assert [m.content for m in reloaded.messages] == ["Old message", "New reply"]
+
+    def test_session_files_are_compact_json(self, tmp_path):
+        """Persisted session JSON is written without pretty-print whitespace."""
+        manager = SessionManager(tmp_path)
+        session = manager.create_new_session()
+        session.messages = [Message("user", "Hello")]
+        manager.save_session(session)
+
+        header = manager._get_session_path(session.id).read_text()
+        assert "\n" not in header
+        assert '"id":"' in header
+        assert (
+            manager._get_log_path(session.id).read_text() == '{"role":"user","content":"Hello"}\n'
+        )
+
+    def test_delete_session_removes_log(self, tmp_path):
+        """Deleting a session removes both the header and the message log."""
+        manager = SessionManager(tmp_path)
+        session = manager.create_new_session()
+        session.messages = [Message("user", "Hello")]
+        manager.save_session(session)
+
+        assert manager.delete_session(session.id) is True
+        assert not manager._get_log_path(session.id).exists()
+
     def test_display_type_roundtrip(self, tmp_path):
         """Test that display_type survives save/load cycle."""
         manager = SessionManager(tmp_path)
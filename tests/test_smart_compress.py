@@ -208,6 +208,29 @@ class TestSmartCompressionBudget:
 # ── Stage 3 (#3): dead 'summarize' strategy removed ──
 
 
+class TestSmartCompressionCost:
+    """Budget checks reuse cached per-message token counts."""
+
+    def test_compress_does_not_retokenize_history(self):
+        history = [Message("user", f"question {i} " * 30) for i in range(30)]
+        cm = _make_cm(history, max_tokens=600, min_keep=2)
+        for msg in cm.history:
+            cm.counter.count_message(msg)
+
+        calls = {"n": 0}
+        original = cm.counter._count_raw
+
+        def counting(text):
+            calls["n"] += 1
+            return original(text)
+
+        cm.counter._count_raw = counting
+        cm._smart_compress()
+
+        assert len(cm.history) < 30
+        assert calls["n"] == 0
+
+
 class TestNoSummarizeStrategy:
     """The 'summarize' compression strategy was unreachable dead code (production
     always uses 'smart'; not user-configurable). It must be removed."""
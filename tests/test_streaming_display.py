@@ -117,6 +117,13 @@ class TestStreamingDisplay:
         assert full.count("Second paragraph.") == 1
         assert full.count("Third paragraph.") == 1
 
+    def test_long_paragraph_flushed_at_line_break(self):
+        """A paragraph past 300 chars is printed up to its last line break."""
+        first_line = "word " * 70
+        tokens = list(first_line + "\n" + "tail " * 5 + "\nend")
+        parts = simulate_streaming(tokens)
+        assert parts == [first_line, "tail " * 5 + "\nend"]
+
     def test_text_before_tool_call_is_printed(self):
         """Text that precedes a tool call tag must be printed."""
         text_before = "Похоже, нет файлов.\n\n"
@@ -6,7 +6,9 @@ assertions (brittle); we verify shape, not exact spacing.
 """
 
 from rich.console import Console
+from rich.text import Text
 
+from supercoder.mdstream import NoInsetMarkdown
 from supercoder.ui import render
 
 
@@ -62,6 +64,19 @@ class TestAssistantMessage:
         text = _render_to_text(result)
         assert "SuperCoder" in text
 
+    def test_plain_prose_skips_markdown(self):
+        content = "Done. The tests pass now.\n\nAnything else?"
+        result = render.render_assistant_message(content)
+        assert isinstance(result.renderable, Text)
+        plain = _render_to_text(result.renderable).splitlines()
+        markdown = _render_to_text(NoInsetMarkdown(content)).splitlines()
+        assert plain == [line.rstrip() for line in markdown]
+
+    def test_markdown_syntax_uses_markdown(self):
+        for content in ("Some **bold**", "1. first", "line one\nline two", "    code"):
+            result = render.render_assistant_message(content)
+            assert isinstance(result.renderable, NoInsetMarkdown), content
+
 
 class TestReasoning:
     def test_renders_content(self):
@@ -3,9 +3,11 @@
 Covers Tasks 2.1, 2.2, and 2.4.
 """
 
+import io
 from datetime import datetime
 
 from rich.console import Console
+from rich.status import Status
 from rich.text import Text
 
 from supercoder.ui import spinners, theme
@@ -39,6 +41,24 @@ class TestSpinnerFrames:
             assert isinstance(name, str) and name
 
 
+class TestStatusFactory:
+    def test_non_terminal_console_gets_null_status(self):
+        # A pipe or log file cannot show a spinner; no refresh thread needed.
+        console = Console(file=io.StringIO(), force_terminal=False)
+        status = spinners.status(console, "Thinking...")
+        assert isinstance(status, spinners.NullStatus)
+        with status:
+            status.update("Still thinking...")
+        status.start()
+        status.stop()
+
+    def test_terminal_console_gets_rich_status(self):
+        console = Console(file=io.StringIO(), force_terminal=True)
+        status = spinners.status(console, "Thinking...")
+        assert isinstance(status, Status)
+        assert status._live.refresh_per_second == theme.GRADIENT_REFRESH_PER_SECOND
+
+
 class TestWaveGradient:
     def test_returns_text_renderable(self):
         result = spinners.wave_gradient("Generating", 0)